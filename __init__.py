@@ -68,12 +68,16 @@ def register():
     from . import ui
     from . import render  # This is needed
     from .utils import util
+    from .translators import geometry_cache
 
     properties.register()
     operators.register()
     ui.register()
     render.register()
+    bpy.app.handlers.load_post.append(properties.nodes.register_used_osl_nodes)
+    bpy.app.handlers.depsgraph_update_post.append(properties.nodes.register_appended_osl_nodes)
     bpy.app.handlers.load_post.append(util.update_project)
+    bpy.app.handlers.load_pre.append(geometry_cache.clear_geometry_cache)
 
 
 def unregister():
@@ -83,9 +87,14 @@ def unregister():
     from . import ui
     from . import render
     from .utils import util
+    from .translators import geometry_cache
     render.unregister()
     ui.unregister()
     operators.unregister()
     properties.unregister()
     preferences.unregister()
+    bpy.app.handlers.load_post.remove(properties.nodes.register_used_osl_nodes)
+    bpy.app.handlers.depsgraph_update_post.remove(properties.nodes.register_appended_osl_nodes)
     bpy.app.handlers.load_post.remove(util.update_project)
+    bpy.app.handlers.load_pre.remove(geometry_cache.clear_geometry_cache)
+    geometry_cache.geometry_cache.clear()
@@ -27,7 +27,8 @@
 
 import bpy
 
-from . import osl_ops, texture_ops
+from . import export_ops, osl_ops, texture_ops
+from ..translators.geometry_cache import geometry_cache
 from ..utils import util
 
 
@@ -161,7 +162,23 @@ class ASSPREF_OT_remove_search_path(bpy.types.Operator):
         return {'FINISHED'}
 
 
-classes = (ASPP_OT_add_postproc_stage,
+class ASGEO_OT_clear_geometry_cache(bpy.types.Operator):
+    """
+    Operator for clearing the geometry cache of final renders
+    """
+
+    bl_label = "Clear Geometry Cache"
+    bl_description = "Remove all meshes kept by the geometry cache, the next render converts every mesh again"
+    bl_idname = "appleseed.clear_geometry_cache"
+
+    def execute(self, context):
+        geometry_cache.clear()
+
+        return {'FINISHED'}
+
+
+classes = (ASGEO_OT_clear_geometry_cache,
+           ASPP_OT_add_postproc_stage,
            ASPP_OT_remove_postproc_stage,
            ASSPREF_OT_add_search_path,
            ASSPREF_OT_remove_search_path,
@@ -172,6 +189,7 @@ classes = (ASPP_OT_add_postproc_stage,
 def register():
     osl_ops.register()
     texture_ops.register()
+    export_ops.register()
     for cls in classes:
         util.safe_register_class(cls)
 
@@ -179,5 +197,6 @@ def register():
 def unregister():
     for cls in reversed(classes):
         util.safe_unregister_class(cls)
+    export_ops.unregister()
     texture_ops.unregister()
     osl_ops.unregister()
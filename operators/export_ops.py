@@ -0,0 +1,156 @@
+#
+# This source file is part of appleseed.
+# Visit http://appleseedhq.net/ for additional information and resources.
+#
+# This software is released under the MIT license.
+#
+# Copyright (c) 2019 The appleseedhq Organization
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import bpy
+
+from ..logger import get_logger
+from ..translators.scene import SceneTranslator
+from ..utils import util
+
+logger = get_logger()
+
+
+class ExportEngine(object):
+    """
+    Stands in for the render engine when projects are exported by an operator.
+    Provides the render engine methods used by the scene translators.
+    """
+
+    def __init__(self, scene):
+        self.__scene = scene
+        self.errors = list()
+
+    def camera_model_matrix(self, camera, use_spherical_stereo=False):
+        return camera.matrix_world.normalized()
+
+    def camera_shift_x(self, camera, use_spherical_stereo=False):
+        return 0.0
+
+    def frame_set(self, frame, subframe=0.0):
+        self.__scene.frame_set(frame, subframe=subframe)
+
+    def error_set(self, message):
+        self.errors.append(message)
+
+    def report(self, report_type, message):
+        self.errors.append(message)
+
+
+class ASEXPORT_OT_export_animation(bpy.types.Operator):
+    """
+    Exports one appleseed project per frame of the scene's frame range
+    """
+
+    bl_label = "Export Animation"
+    bl_description = "Export one appleseed project per frame, sharing geometry files between frames"
+    bl_idname = "appleseed.export_animation"
+
+    @classmethod
+    def poll(cls, context):
+        return context.scene.appleseed.export_path != ""
+
+    def execute(self, context):
+        scene = context.scene
+        frames = range(scene.frame_start, scene.frame_end + 1, scene.frame_step)
+
+        context.window_manager.progress_begin(0, len(frames))
+
+        def report_progress(index, frame, elapsed):
+            context.window_manager.progress_update(index + 1)
+
+        try:
+            stats = export_frames(context, frames, report_progress)
+        finally:
+            context.window_manager.progress_end()
+
+        for message in stats['errors']:
+            self.report({'WARNING'}, message)
+
+        self.report({'INFO'}, f"appleseed: Exported {len(frames)} frames in {stats['time']:.2f} seconds, "
+                              f"geometry written: {stats['written_bytes'] / (1024 * 1024):.2f} MB, "
+                              f"deduplicated: {stats['reused_bytes'] / (1024 * 1024):.2f} MB")
+
+        return {'FINISHED'}
+
+
+def export_frames(context, frames, progress_callback=None, manifest_suffix=None):
+    """
+    Exports one project per frame.  progress_callback(index, frame, elapsed) is called after each frame.
+    Exports running in parallel must pass different manifest suffixes.
+    Returns the export statistics.
+    """
+
+    scene = context.scene
+    current_frame = scene.frame_current
+
+    export_timer = util.Timer()
+    engine = ExportEngine(scene)
+
+    # All frames share one asset handler, so meshes that are identical between frames are written once
+    # to the shared geometry directory.  Its manifest keeps the fingerprints of mesh datablocks, so
+    # objects without modifiers, shape keys and animated mesh properties are only evaluated for the
+    # first frame.  Other objects are evaluated on every frame.
+    asset_handler = SceneTranslator.create_export_asset_handler(context.evaluated_depsgraph_get(),
+                                                                incremental=True,
+                                                                manifest_suffix=manifest_suffix)
+
+    try:
+        with asset_handler.mesh_writer:
+            for index, frame in enumerate(frames):
+                frame_timer = util.Timer()
+
+                scene.frame_set(frame)
+                depsgraph = context.evaluated_depsgraph_get()
+
+                filename = SceneTranslator.get_project_filename(scene.appleseed.export_path, frame)
+                logger.debug("appleseed: Exporting frame %s to %s", frame, filename)
+
+                scene_translator = SceneTranslator.create_project_export_translator(depsgraph, asset_handler)
+                scene_translator.translate_scene(engine, depsgraph)
+                scene_translator.write_project(filename)
+
+                frame_timer.stop()
+
+                if progress_callback is not None:
+                    progress_callback(index, frame, frame_timer.elapsed())
+    finally:
+        scene.frame_set(current_frame)
+
+    export_timer.stop()
+
+    return {'time': export_timer.elapsed(),
+            'written_bytes': asset_handler.mesh_writer.written_bytes,
+            'reused_bytes': asset_handler.mesh_writer.reused_bytes,
+            'errors': engine.errors}
+
+
+def register():
+    util.safe_register_class(ASEXPORT_OT_export_animation)
+
+
+def unregister():
+    util.safe_unregister_class(ASEXPORT_OT_export_animation)
@@ -30,7 +30,7 @@ import bpy
 
 import appleseed as asr
 from ..properties.nodes import AppleseedOSLScriptNode
-from ..utils import path_util, osl_utils, util
+from ..utils import osl_utils, util
 
 
 class ASMAT_OT_compile_script(bpy.types.Operator):
@@ -63,10 +63,7 @@ class ASMAT_OT_compile_script(bpy.types.Operator):
                         outputs.append(link.to_socket)
                     output_connections[output.bl_idname] = outputs
 
-            stdosl_path = path_util.get_stdosl_paths()
-            compiler = asr.ShaderCompiler(stdosl_path)
-            osl_bytecode = osl_utils.compile_osl_bytecode(compiler,
-                                                          script)
+            osl_bytecode = osl_utils.compile_osl_bytecode(None, script)
 
             if osl_bytecode is not None:
                 q = asr.ShaderQuery()
@@ -27,6 +27,8 @@
 
 import bpy
 import nodeitems_utils
+from bl_operators.node import NodeAddOperator
+from bpy.app.handlers import persistent
 from nodeitems_builtins import ShaderNodeCategory
 
 from ..logger import get_logger
@@ -134,6 +136,13 @@ class AppleseedOSLNode(bpy.types.Node):
             for socket in self.socket_output_names:
                 self.outputs.new(socket[0], socket[1])
 
+        # Remember the node types used by the tree so they can be registered when the file is loaded.
+        used_nodes = self.id_data.get("appleseed_osl_nodes")
+        if used_nodes is None:
+            self.id_data["appleseed_osl_nodes"] = {self.bl_idname: 1}
+        else:
+            used_nodes[self.bl_idname] = 1
+
 
 class AppleseedOSLScriptNode(AppleseedOSLNode):
     bl_idname = "AppleseedOSLScriptNode"
@@ -252,7 +261,7 @@ def node_categories(osl_nodes):
     cyc_nodes = [nodeitems_utils.NodeItem(key) for key in cycles_nodes.keys()]
 
     for node in osl_nodes:
-        node_item = nodeitems_utils.NodeItem(node[0])
+        node_item = nodeitems_utils.NodeItem(node[0], label=node[2])
         node_category = node[1]
         if node_category == 'shader':
             osl_shaders.append(node_item)
@@ -285,6 +294,12 @@ def node_categories(osl_nodes):
 
 osl_node_names = list()
 
+# Parsed shaders by node type, for the OSL nodes that are not registered yet.
+pending_osl_nodes = dict()
+
+# Node types the add-on creates itself, these are registered at startup.
+startup_osl_nodes = ("AppleseedasClosure2SurfaceNode",)
+
 classes = [AppleseedOSLScriptBaseNode]
 
 preview_collections = dict()
@@ -299,6 +314,112 @@ def hide_non_appleseed_nodes(method):
 old_shader_node_category_poll = None
 
 
+def register_osl_node_on_add(method):
+    # The menu and the node search add nodes through NodeAddOperator, so OSL node classes are registered there.
+    def func(self, context, node_type=None):
+        bl_idname = self.type if node_type is None else node_type
+        if bl_idname in pending_osl_nodes:
+            register_osl_node(bl_idname)
+        return method(self, context, node_type)
+    return func
+
+old_node_add_create_node = None
+
+# Number of node trees in the file when their OSL nodes were last registered.
+registered_node_tree_count = 0
+
+
+def register_osl_node(bl_idname):
+    """
+    Generates and registers the classes of an OSL node found at startup.
+    Returns False if bl_idname is not an appleseed OSL node.
+    """
+
+    node = pending_osl_nodes.pop(bl_idname, None)
+    if node is None:
+        return any(node_name[0] == bl_idname for node_name in osl_node_names)
+
+    logger.debug("[appleseed] Registering OSL node {0}".format(bl_idname))
+
+    node_name, node_category, node_classes = osl_utils.generate_node(node, AppleseedOSLNode)
+    classes.extend(node_classes)
+
+    for cls in node_classes:
+        util.safe_register_class(cls)
+
+    return True
+
+
+@persistent
+def register_used_osl_nodes(_):
+    """
+    Registers the OSL nodes used by the node trees of a newly loaded file.
+    """
+
+    global registered_node_tree_count
+    registered_node_tree_count = get_node_tree_count()
+
+    if not pending_osl_nodes:
+        return
+
+    for node_tree in get_node_trees():
+        used_nodes = node_tree.get("appleseed_osl_nodes")
+        if used_nodes is not None:
+            for bl_idname in used_nodes.keys():
+                register_osl_node(bl_idname)
+
+    # Nodes can also have been added to the tree without being recorded, for example in files saved
+    # by older versions or when they were pasted.  Undefined nodes may only report a generic type,
+    # in which case their default name, the shader name, is used to find the node type.
+    has_unknown_nodes = False
+
+    for node_tree in get_node_trees():
+        for node in node_tree.nodes:
+            if node.bl_idname in pending_osl_nodes:
+                register_osl_node(node.bl_idname)
+            elif node.bl_idname == "NodeUndefined":
+                base_name, _, suffix = node.name.rpartition(".")
+                shader_name = base_name if base_name and suffix.isdigit() else node.name
+                bl_idname = osl_utils.get_node_idname({'name': shader_name})
+                if not register_osl_node(bl_idname) and node_tree.bl_idname == 'ShaderNodeTree':
+                    has_unknown_nodes = True
+
+    # Renamed nodes can't be identified, the only way to restore them is to register every node.
+    # Undefined nodes in trees of other types belong to other add-ons and are left alone.
+    if has_unknown_nodes:
+        logger.debug("[appleseed] Undefined shader nodes found, registering all OSL nodes")
+        for bl_idname in list(pending_osl_nodes.keys()):
+            register_osl_node(bl_idname)
+
+
+@persistent
+def register_appended_osl_nodes(_):
+    """
+    Registers the OSL nodes used by node trees appended or linked from another file.
+    """
+
+    if pending_osl_nodes and get_node_tree_count() != registered_node_tree_count:
+        register_used_osl_nodes(None)
+
+
+def get_node_tree_count():
+    return len(bpy.data.materials) + len(bpy.data.node_groups) + len(bpy.data.lights)
+
+
+def get_node_trees():
+    for material in bpy.data.materials:
+        if material.node_tree is not None:
+            yield material.node_tree
+
+    for node_group in bpy.data.node_groups:
+        yield node_group
+
+    # Area lights have their own OSL node trees.
+    for light in bpy.data.lights:
+        if light.use_nodes and light.node_tree is not None:
+            yield light.node_tree
+
+
 def register():
     import bpy.utils.previews
     import os
@@ -310,19 +431,27 @@ def register():
 
     preview_collections["main"] = pcoll
 
+    # Node classes are generated when a node is first used, see register_osl_node.
     node_list = osl_utils.read_osl_shaders()
     for node in node_list:
-        node_name, node_category, node_classes = osl_utils.generate_node(node, AppleseedOSLNode)
-        classes.extend(node_classes)
-        osl_node_names.append([node_name, node_category])
+        node_name = osl_utils.get_node_idname(node)
+        pending_osl_nodes[node_name] = node
+        osl_node_names.append([node_name, node['category'], node['name']])
 
     global old_shader_node_category_poll
     old_shader_node_category_poll = ShaderNodeCategory.poll
     ShaderNodeCategory.poll = hide_non_appleseed_nodes(ShaderNodeCategory.poll)
 
+    global old_node_add_create_node
+    old_node_add_create_node = NodeAddOperator.create_node
+    NodeAddOperator.create_node = register_osl_node_on_add(NodeAddOperator.create_node)
+
     for cls in classes:
         util.safe_register_class(cls)
 
+    for node_name in startup_osl_nodes:
+        register_osl_node(node_name)
+
     nodeitems_utils.register_node_categories("APPLESEED", node_categories(osl_node_names))
 
 
@@ -334,6 +463,9 @@ def unregister():
     nodeitems_utils.unregister_node_categories("APPLESEED")
 
     ShaderNodeCategory.poll = old_shader_node_category_poll
+    NodeAddOperator.create_node = old_node_add_create_node
 
     for cls in reversed(classes):
         util.safe_unregister_class(cls)
+
+    pending_osl_nodes.clear()
@@ -211,6 +211,11 @@ class AppleseedRenderSettings(bpy.types.PropertyGroup):
     export_path: bpy.props.StringProperty(name="export_path",
                                           subtype='FILE_PATH')
 
+    export_incremental: bpy.props.BoolProperty(name="export_incremental",
+                                               description="Reuse the geometry files of the previous export for meshes without modifiers and shape keys that did not change, without evaluating them.\n"
+                                                           "Changes are tracked in a manifest file next to the project file",
+                                               default=False)
+
     threads_auto: bpy.props.BoolProperty(name="threads_auto",
                                          description="Automatically determine the number of rendering threads",
                                          default=True)
@@ -245,6 +250,36 @@ class AppleseedRenderSettings(bpy.types.PropertyGroup):
                                      description="Size of the texture cache in MB",
                                      default=1024)
 
+    geometry_cache_size: bpy.props.IntProperty(name="geometry_cache_size",
+                                               description="Size of the cache in MB used for keeping converted meshes between final renders.\n"
+                                                           "Unchanged meshes are not converted again on the next render.  Use 0 to disable the cache",
+                                               default=0,
+                                               min=0)
+
+    tile_queue_depth: bpy.props.IntProperty(name="tile_queue_depth",
+                                            description="Maximum number of finished tiles waiting to be sent to Blender.\n"
+                                                        "Render threads wait when the queue is full",
+                                            default=32,
+                                            min=1,
+                                            max=4096)
+
+    result_update_interval: bpy.props.FloatProperty(name="result_update_interval",
+                                                    description="Minimum time in seconds between updates of the render result.\n"
+                                                                "Finished tiles are batched until the interval has elapsed.  Use 0 to update after every tile",
+                                                    default=0.0,
+                                                    min=0.0,
+                                                    soft_max=5.0,
+                                                    subtype='TIME',
+                                                    unit='TIME')
+
+    stats_update_interval: bpy.props.FloatProperty(name="stats_update_interval",
+                                                   description="Minimum time in seconds between progress and stats updates during final renders",
+                                                   default=0.1,
+                                                   min=0.0,
+                                                   soft_max=2.0,
+                                                   subtype='TIME',
+                                                   unit='TIME')
+
     export_hair: bpy.props.BoolProperty(name="export_hair",
                                         description="Export hair particle systems as renderable geometry",
                                         default=False)
@@ -323,6 +358,14 @@ class AppleseedRenderSettings(bpy.types.PropertyGroup):
     interactive_max_time: bpy.props.IntProperty(name="interactive_max_time",
                                                 default=60)
 
+    interactive_update_window: bpy.props.FloatProperty(name="interactive_update_window",
+                                                       description="Scene changes made within this time are gathered and applied to the interactive render together",
+                                                       default=0.1,
+                                                       min=0.0,
+                                                       soft_max=1.0,
+                                                       subtype='TIME',
+                                                       unit='TIME')
+
     force_aa: bpy.props.BoolProperty(name="force_aa",
                                      description="When using 1 sample/pixel and Force Anti-Aliasing is disabled, samples are placed at the center of pixels",
                                      default=True)
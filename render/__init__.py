@@ -27,6 +27,7 @@
 
 import sys
 import threading
+import time
 
 import bpy
 import bgl
@@ -34,6 +35,7 @@ import bgl
 import appleseed as asr
 from .final_tilecallback import FinalTileCallback
 from .renderercontroller import FinalRendererController, InteractiveRendererController
+from .update_coalescer import UpdateCoalescer
 from ..logger import get_logger
 from ..translators.preview import PreviewRenderer
 from ..translators.scene import SceneTranslator
@@ -50,7 +52,11 @@ class RenderThread(threading.Thread):
         self.__renderer_controller = render_controller
 
     def run(self):
-        self.__renderer.render(self.__renderer_controller)
+        try:
+            self.__renderer.render(self.__renderer_controller)
+        finally:
+            # Make sure waiting threads wake up even if appleseed failed before signaling.
+            self.__renderer_controller.signal_finished()
 
 
 class SetAppleseedLogLevel(object):
@@ -93,6 +99,8 @@ class RenderAppleseed(bpy.types.RenderEngine):
 
         # Interactive rendering.
         self.__interactive_scene_translator = None
+        self.__update_coalescer = None
+        self.__update_flush_timer = None
         self.__updated_scene = False
 
     #
@@ -135,14 +143,22 @@ class RenderAppleseed(bpy.types.RenderEngine):
         if self.__interactive_scene_translator is None:
             self.__start_interactive_render(context, depsgraph)
         else:
-            self.__pause_rendering()
-            logger.debug("appleseed: Updating scene")
-            self.__interactive_scene_translator.update_scene(depsgraph, self)
-            self.__restart_interactive_render()
+            self.__update_coalescer.add_updates(depsgraph.updates,
+                                                self.__interactive_scene_translator.is_update_relevant)
+
+            if self.__update_coalescer.is_ready:
+                self.__apply_scene_updates(depsgraph)
+            elif self.__update_coalescer.has_pending_updates:
+                self.__schedule_update_flush()
 
         self.__updated_scene = True
 
     def view_draw(self, context, depsgraph):
+        if self.__update_coalescer.is_ready:
+            self.__apply_scene_updates(depsgraph)
+        elif self.__update_coalescer.has_pending_updates:
+            self.__schedule_update_flush()
+
         if not self.__updated_scene:
             # Check if view camera model has changes
             updates = self.__interactive_scene_translator.check_view_window(depsgraph, context)
@@ -232,9 +248,11 @@ class RenderAppleseed(bpy.types.RenderEngine):
 
         if depsgraph.scene.appleseed.scene_export_mode == 'export_only':
             if depsgraph.scene.appleseed.export_path != "":
-                scene_translator = SceneTranslator.create_project_export_translator(depsgraph)
-                scene_translator.translate_scene(self, depsgraph)
-                scene_translator.write_project(depsgraph.scene.appleseed.export_path)
+                asset_handler = SceneTranslator.create_export_asset_handler(depsgraph)
+                with asset_handler.mesh_writer:
+                    scene_translator = SceneTranslator.create_project_export_translator(depsgraph, asset_handler)
+                    scene_translator.translate_scene(self, depsgraph)
+                    scene_translator.write_project(depsgraph.scene.appleseed.export_path)
             else:
                 self.error_set("appleseed: Export path not set!")
         else:
@@ -268,7 +286,9 @@ class RenderAppleseed(bpy.types.RenderEngine):
 
         self.__tile_callback = FinalTileCallback(self, scene)
 
-        self.__renderer_controller = FinalRendererController(self, self.__tile_callback)
+        self.__renderer_controller = FinalRendererController(self,
+                                                             self.__tile_callback,
+                                                             scene.appleseed.stats_update_interval)
 
         self.__renderer = asr.MasterRenderer(
             project,
@@ -282,11 +302,25 @@ class RenderAppleseed(bpy.types.RenderEngine):
         log_target = asr.ConsoleLogTarget(sys.stderr)
         asr.global_logger().add_target(log_target)
 
-        # Start render thread and wait for it to finish.
+        # Start render thread and deliver finished tiles to Blender until it finishes.
+        # Tiles and the end of the render both wake this thread up immediately.
         self.__render_thread.start()
 
-        while self.__render_thread.isAlive():
-            self.__render_thread.join(0.5)  # seconds
+        finished = self.__renderer_controller.finished
+
+        while not finished.is_set():
+            self.__tile_callback.process_tiles(timeout=0.5)  # seconds
+
+        logger.debug("appleseed: Render engine resumed %f seconds after the end of the render",
+                     time.time() - self.__renderer_controller.finish_time)
+
+        # Deliver tiles queued just before the render finished.
+        self.__tile_callback.process_tiles(timeout=0)
+        self.__tile_callback.flush_tiles()
+        self.__renderer_controller.status_reporter.update(force=True)
+        self.__tile_callback.log_queue_stats()
+
+        self.__render_thread.join()
 
         # Cleanup.
         asr.global_logger().remove_target(log_target)
@@ -312,6 +346,8 @@ class RenderAppleseed(bpy.types.RenderEngine):
         self.__interactive_scene_translator = SceneTranslator.create_interactive_render_translator(depsgraph)
         self.__interactive_scene_translator.translate_scene(self, depsgraph, context)
 
+        self.__update_coalescer = UpdateCoalescer(depsgraph.scene_eval.appleseed.interactive_update_window)
+
         project = self.__interactive_scene_translator.as_project
 
         self.__renderer_controller = InteractiveRendererController()
@@ -325,6 +361,41 @@ class RenderAppleseed(bpy.types.RenderEngine):
 
         self.__restart_interactive_render()
 
+    def __schedule_update_flush(self):
+        """
+        Redraw once the gathering window elapses, pending updates are then applied from view_draw.
+        """
+
+        if self.__update_flush_timer is not None:
+            return
+
+        def flush_updates():
+            self.__update_flush_timer = None
+            try:
+                self.tag_redraw()
+            except ReferenceError:
+                # The render engine was freed while the timer was pending.
+                pass
+            return None
+
+        self.__update_flush_timer = flush_updates
+        bpy.app.timers.register(flush_updates, first_interval=self.__update_coalescer.remaining_time)
+
+    def __apply_scene_updates(self, depsgraph):
+        """
+        Apply the coalesced scene updates as one batch.
+        """
+
+        updates = self.__update_coalescer.take_updates()
+
+        if not updates:
+            return
+
+        self.__pause_rendering()
+        logger.debug("appleseed: Updating scene")
+        self.__interactive_scene_translator.update_scene(depsgraph, self, updates)
+        self.__restart_interactive_render()
+
     def __restart_interactive_render(self):
         """
         Restart the interactive renderer.
@@ -344,8 +415,7 @@ class RenderAppleseed(bpy.types.RenderEngine):
         logger.debug("appleseed: Pause rendering")
         try:
             if self.__render_thread:
-                self.__renderer_controller.set_status(asr.IRenderControllerStatus.AbortRendering)
-                self.__render_thread.join()
+                self.__abort_render_thread()
         except:
             pass
 
@@ -360,8 +430,7 @@ class RenderAppleseed(bpy.types.RenderEngine):
         logger.debug("appleseed: Abort rendering")
         try:
             if self.__render_thread:
-                self.__renderer_controller.set_status(asr.IRenderControllerStatus.AbortRendering)
-                self.__render_thread.join()
+                self.__abort_render_thread()
         except:
             pass
 
@@ -371,6 +440,24 @@ class RenderAppleseed(bpy.types.RenderEngine):
         self.__renderer_controller = None
         self.__tile_callback = None
         self.__interactive_scene_translator = None
+        self.__update_coalescer = None
+
+        if self.__update_flush_timer is not None:
+            if bpy.app.timers.is_registered(self.__update_flush_timer):
+                bpy.app.timers.unregister(self.__update_flush_timer)
+            self.__update_flush_timer = None
+
+    def __abort_render_thread(self):
+        """
+        Signal appleseed to stop rendering and wait until the render thread is done.
+        """
+
+        abort_time = time.time()
+
+        self.__renderer_controller.set_status(asr.IRenderControllerStatus.AbortRendering)
+        self.__render_thread.join()
+
+        logger.debug("appleseed: Render thread stopped %f seconds after abort request", time.time() - abort_time)
 
     def __draw_pixels(self, context, depsgraph):
         """
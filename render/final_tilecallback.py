@@ -25,9 +25,13 @@
 # THE SOFTWARE.
 #
 
+import queue
+import threading
 import time
 from math import ceil
 
+import numpy as np
+
 import appleseed as asr
 from ..logger import get_logger
 from ..utils import util
@@ -35,6 +39,26 @@ from ..utils import util
 logger = get_logger()
 
 
+class TileUpdate(object):
+    """
+    Snapshot of a finished tile waiting to be delivered to Blender.
+    """
+
+    def __init__(self, x, y, width, height, pass_number, passes):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.pass_number = pass_number
+        self.passes = passes
+        self.queued_time = None
+        self.tile_count = 1
+
+    @property
+    def mergeable(self):
+        return all(isinstance(pixels, np.ndarray) for _, pixels in self.passes)
+
+
 class FinalTileCallback(asr.ITileCallback):
     """
     The TileCallback is responsible for sending the results of the render back to Blender
@@ -48,6 +72,7 @@ class FinalTileCallback(asr.ITileCallback):
 
         self.__pass_incremented = False
         self.__render_stats = ["Starting", ""]
+        self.__stats_outdated = False
 
         # Compute render resolution.
         (width, height) = util.get_render_resolution(self.__scene)
@@ -80,11 +105,45 @@ class FinalTileCallback(asr.ITileCallback):
         self.__pass_number = 1
 
         self.__rendered_tiles = 0
+        self.__delivered_pass = 1
+
+        # Tiles are copied with NumPy array operations when the tile storage
+        # exposes a usable buffer.  Otherwise fall back to building pixel lists.
+        self.__use_array_transfer = True
+
+        # Finished tiles are snapshotted by appleseed's render threads and queued.
+        # The render engine drains the queue into Blender from its own thread.
+        self.__tile_queue = queue.Queue(maxsize=scene.appleseed.tile_queue_depth)
+        self.__stats_lock = threading.Lock()
+        self.__queue_wait_time = 0.0
+        self.__queue_latency = 0.0
+        self.__delivered_tiles = 0
+
+        # Delivered tiles are held back and written in batches when an update interval is set.
+        self.__update_interval = scene.appleseed.result_update_interval
+        self.__pending_tiles = list()
+        self.__last_flush_time = time.time()
 
     @property
     def render_stats(self):
+        if self.__stats_outdated:
+            self.__stats_outdated = False
+
+            seconds_per_pixel = (time.time() - self.__time_start) / self.__rendered_pixels
+            remaining_seconds = (self.__total_pixels - self.__rendered_pixels) * seconds_per_pixel
+            self.__render_stats = ["appleseed Rendering: Pass %i of %i, Tile %i of %i completed" %
+                                   (self.__delivered_pass,
+                                    self.__total_passes,
+                                    self.__rendered_tiles,
+                                    self.__total_tiles),
+                                   "Time Remaining: {0}".format(self.__format_seconds_to_hhmmss(remaining_seconds))]
+
         return self.__render_stats
 
+    @property
+    def progress(self):
+        return self.__rendered_pixels / self.__total_pixels
+
     def on_tiled_frame_begin(self, frame):
         self.__pass_incremented = False
         if self.__pass_number == 1:
@@ -94,14 +153,13 @@ class FinalTileCallback(asr.ITileCallback):
         if not self.__pass_incremented:
             self.__pass_number += 1
             self.__pass_incremented = True
-        self.__rendered_tiles = 0
 
     def on_tile_begin(self, frame, tile_x, tile_y, thread_index, thread_count):
         pass
 
     def on_tile_end(self, frame, tile_x, tile_y):
         """
-        Processes the tile data as it finished
+        Snapshots the finished tile and queues it for delivery to Blender
         """
 
         logger.debug("Finished tile %s %s", tile_x, tile_y)
@@ -144,74 +202,228 @@ class FinalTileCallback(asr.ITileCallback):
         x0 = ix0 - self.__min_x  # left
         y0 = self.__max_y - iy1  # bottom
 
-        # Update image.
+        passes = [("Combined", self.__get_pixels(image,
+                                                 tile_x,
+                                                 tile_y,
+                                                 take_x,
+                                                 take_y,
+                                                 skip_x,
+                                                 skip_y))]
+
+        for aov in frame.aovs():
+            model = aov.get_model()
+            if model not in ("cryptomatte_object_aov", "cryptomatte_material_aov"):
+                image = aov.get_image()
+                pixel_buffer = self.__get_pixels(image,
+                                                 tile_x,
+                                                 tile_y,
+                                                 take_x,
+                                                 take_y,
+                                                 skip_x,
+                                                 skip_y)
+                passes.append((self.__map_aovs(aov.get_name()), pixel_buffer))
+            else:
+                image = aov.get_cryptomatte_image()
+                pixel_buffer = self.__get_pixels(image,
+                                                 tile_x,
+                                                 tile_y,
+                                                 take_x,
+                                                 take_y,
+                                                 skip_x,
+                                                 skip_y)
+                crypto_pixels = self.__process_crypto_pixels(pixel_buffer)
+
+                for i, pixels in enumerate(crypto_pixels):
+                    passes.append((f"{self.__map_aovs(model)}0{i}", pixels))
+
+        self.__enqueue_tile(TileUpdate(x0, y0, take_x, take_y, self.__pass_number, passes))
+
+    def process_tiles(self, timeout=None):
+        """
+        Collects queued tiles and delivers them to Blender.  Must be called from the render engine thread.
+        Blocks for at most timeout seconds waiting for the first tile or a wake up request,
+        then drains whatever else is already queued.  With a result update interval set,
+        tiles are held back until the interval has elapsed.
+        """
+
+        tile_updates = list()
+
+        try:
+            tile_updates.append(self.__tile_queue.get(timeout=timeout))
+
+            while True:
+                tile_updates.append(self.__tile_queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        for tile_update in tile_updates:
+            # None is a wake up request.
+            if tile_update is not None:
+                self.__queue_latency += time.time() - tile_update.queued_time
+                self.__pending_tiles.append(tile_update)
+
+        if time.time() - self.__last_flush_time >= self.__update_interval:
+            self.flush_tiles()
+
+    def wake(self):
+        """
+        Wakes up the render engine thread if it is waiting in process_tiles.
+        """
+
+        try:
+            self.__tile_queue.put_nowait(None)
+        except queue.Full:
+            # The engine has tiles to process and will not block.
+            pass
+
+    def flush_tiles(self):
+        """
+        Writes all pending tiles into Blender's render result.
+        """
+
+        if not self.__pending_tiles:
+            return
+
+        for tile_update in self.__merge_tile_rows(self.__pending_tiles):
+            self.__deliver_tile(tile_update)
+
+        self.__pending_tiles = list()
+        self.__last_flush_time = time.time()
+
+    def log_queue_stats(self):
+        with self.__stats_lock:
+            wait_time = self.__queue_wait_time
+
+        average_latency = self.__queue_latency / self.__delivered_tiles if self.__delivered_tiles > 0 else 0.0
+
+        logger.debug("appleseed: Delivered %i tiles, render threads waited %f seconds on a full queue, average queue latency %f seconds",
+                     self.__delivered_tiles,
+                     wait_time,
+                     average_latency)
+
+    def __enqueue_tile(self, tile_update):
+        # The engine thread can take the tile as soon as it is queued, so it is timestamped first.
+        tile_update.queued_time = time.time()
+        self.__tile_queue.put(tile_update)
+        wait_time = time.time() - tile_update.queued_time
+
+        with self.__stats_lock:
+            self.__queue_wait_time += wait_time
+
+    def __deliver_tile(self, tile_update):
+        self.__delivered_tiles += tile_update.tile_count
+
+        # Write all passes, then hand the result to Blender in a single update.
         render_view = self.__engine.active_view_get()
-        result = self.__engine.begin_result(x0,
-                                            y0,
-                                            take_x,
-                                            take_y,
+        result = self.__engine.begin_result(tile_update.x,
+                                            tile_update.y,
+                                            tile_update.width,
+                                            tile_update.height,
                                             view=render_view)
-        layer = result.layers[0].passes.find_by_name("Combined", render_view)
-        pix = self.__get_pixels(image,
-                                tile_x,
-                                tile_y,
-                                take_x,
-                                take_y,
-                                skip_x,
-                                skip_y)
-        layer.rect = pix
-        if len(frame.aovs()) > 0:
-            self.__engine.update_result(result)
-            for aov in frame.aovs():
-                model = aov.get_model()
-                if model not in ("cryptomatte_object_aov", "cryptomatte_material_aov"):
-                    image = aov.get_image()
-                    pixel_buffer = self.__get_pixels(image,
-                                                     tile_x,
-                                                     tile_y,
-                                                     take_x,
-                                                     take_y,
-                                                     skip_x,
-                                                     skip_y)
-                    layer = result.layers[0].passes.find_by_name(self.__map_aovs(aov.get_name()), render_view)
-                    layer.rect = pixel_buffer
-                    self.__engine.update_result(result)
-                else:
-                    image = aov.get_cryptomatte_image()
-                    pixel_buffer = self.__get_pixels(image,
-                                                     tile_x,
-                                                     tile_y,
-                                                     take_x,
-                                                     take_y,
-                                                     skip_x,
-                                                     skip_y)
-                    crypto_pixels = self.__process_crypto_pixels(pixel_buffer)
-
-                    for i, pixels in enumerate(crypto_pixels):
-                        layer = result.layers[0].passes.find_by_name(f"{self.__map_aovs(model)}0{i}", render_view)
-                        layer.rect = pixels
-                        self.__engine.update_result(result)
+
+        for pass_name, pixels in tile_update.passes:
+            layer = result.layers[0].passes.find_by_name(pass_name, render_view)
+            layer.rect = pixels
 
         self.__engine.end_result(result)
 
-        # Update progress bar.
-        self.__rendered_pixels += take_x * take_y
-        self.__engine.update_progress(self.__rendered_pixels / self.__total_pixels)
-
-        # Update stats.
-        seconds_per_pixel = (time.time() - self.__time_start) / self.__rendered_pixels
-        remaining_seconds = (self.__total_pixels - self.__rendered_pixels) * seconds_per_pixel
-        self.__rendered_tiles += 1
-        self.__render_stats = ["appleseed Rendering: Pass %i of %i, Tile %i of %i completed" %
-                               (self.__pass_number,
-                                self.__total_passes,
-                                self.__rendered_tiles,
-                                self.__total_tiles),
-                               "Time Remaining: {0}".format(self.__format_seconds_to_hhmmss(remaining_seconds))]
+        self.__rendered_pixels += tile_update.width * tile_update.height
 
-    @staticmethod
-    def __get_pixels(image, tile_x, tile_y, take_x, take_y, skip_x, skip_y):
+        if tile_update.pass_number != self.__delivered_pass:
+            self.__delivered_pass = tile_update.pass_number
+            self.__rendered_tiles = 0
+
+        self.__rendered_tiles += tile_update.tile_count
+
+        # Stats are formatted lazily, when they are actually reported.
+        self.__stats_outdated = True
+
+    def __get_pixels(self, image, tile_x, tile_y, take_x, take_y, skip_x, skip_y):
         tile = image.tile(tile_x, tile_y)
+
+        if self.__use_array_transfer:
+            try:
+                return self.__get_pixels_array(tile, take_x, take_y, skip_x, skip_y)
+            except (TypeError, ValueError) as e:
+                logger.debug("appleseed: Array tile transfer unavailable (%s), using fallback path", e)
+                self.__use_array_transfer = False
+
+        return self.__get_pixels_list(tile, take_x, take_y, skip_x, skip_y)
+
+    @staticmethod
+    def __merge_tile_rows(tile_updates):
+        """
+        Joins horizontally adjacent tiles of the same row into a single update,
+        so that a batch of tiles needs fewer render results.
+        Blender overwrites the whole region of a render result, so only tiles
+        that exactly cover the merged region can be joined.
+        """
+
+        rows = list()
+
+        for tile_update in sorted(tile_updates, key=lambda t: (t.y, t.height, t.x)):
+            if rows:
+                last = rows[-1][-1]
+                if (last.y == tile_update.y and
+                        last.height == tile_update.height and
+                        last.x + last.width == tile_update.x and
+                        last.mergeable and
+                        tile_update.mergeable and
+                        [p[0] for p in last.passes] == [p[0] for p in tile_update.passes]):
+                    rows[-1].append(tile_update)
+                    continue
+
+            rows.append([tile_update])
+
+        merged = list()
+
+        for row in rows:
+            if len(row) == 1:
+                merged.append(row[0])
+                continue
+
+            height = row[0].height
+            passes = list()
+            for index, (pass_name, _) in enumerate(row[0].passes):
+                channels = row[0].passes[index][1].shape[1]
+                pixels = np.concatenate([t.passes[index][1].reshape(height, t.width, channels) for t in row], axis=1)
+                passes.append((pass_name, pixels.reshape(-1, channels)))
+
+            tile_update = TileUpdate(row[0].x,
+                                     row[0].y,
+                                     sum(t.width for t in row),
+                                     height,
+                                     max(t.pass_number for t in row),
+                                     passes)
+            tile_update.tile_count = sum(t.tile_count for t in row)
+            merged.append(tile_update)
+
+        return merged
+
+    @staticmethod
+    def __get_pixels_array(tile, take_x, take_y, skip_x, skip_y):
+        """
+        Crops and vertically flips the tile storage in a single array operation.
+        Returns a (pixels, channels) float array that can be assigned directly to a render pass.
+        """
+
+        tile_w = tile.get_width()
+        tile_h = tile.get_height()
+        tile_c = tile.get_channel_count()
+
+        floats = np.frombuffer(tile.get_storage(), dtype=np.float32)
+
+        if floats.size != tile_w * tile_h * tile_c:
+            raise ValueError(f"unexpected tile storage size {floats.size}")
+
+        window = floats.reshape(tile_h, tile_w, tile_c)[skip_y:skip_y + take_y, skip_x:skip_x + take_x]
+
+        # Blender expects rows bottom to top.  Always copy, since the tile
+        # storage is reused by appleseed once the callback returns.
+        return np.array(window[::-1]).reshape(take_x * take_y, tile_c)
+
+    @staticmethod
+    def __get_pixels_list(tile, take_x, take_y, skip_x, skip_y):
         tile_w = tile.get_width()
         tile_c = tile.get_channel_count()
 
@@ -221,12 +433,18 @@ class FinalTileCallback(asr.ITileCallback):
         for y in range(take_y - 1, -1, -1):
             start_pix = (skip_y + y) * tile_w + skip_x
             end_pix = start_pix + take_x
-            pixel_buffer.extend(floats[p * tile_c:p * tile_c + tile_c] for p in range(start_pix, end_pix))
+            pixel_buffer.extend(list(floats[p * tile_c:p * tile_c + tile_c]) for p in range(start_pix, end_pix))
 
         return pixel_buffer
 
     @staticmethod
     def __process_crypto_pixels(pixel_buffer):
+        if isinstance(pixel_buffer, np.ndarray):
+            # Split the cropped cryptomatte tile into its three RGBA layers.
+            return [np.ascontiguousarray(pixel_buffer[:, 3:7]),
+                    np.ascontiguousarray(pixel_buffer[:, 7:11]),
+                    np.ascontiguousarray(pixel_buffer[:, 11:])]
+
         layer_1_pixels = list()
         layer_2_pixels = list()
         layer_3_pixels = list()
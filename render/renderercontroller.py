@@ -25,6 +25,9 @@
 # THE SOFTWARE.
 #
 
+import threading
+import time
+
 import appleseed as asr
 
 from ..logger import get_logger
@@ -37,17 +40,36 @@ class BaseRendererController(asr.IRendererController):
         super(BaseRendererController, self).__init__()
         self._status = asr.IRenderControllerStatus.ContinueRendering
 
+        # Set when appleseed finishes or aborts rendering, so waiting threads wake immediately.
+        self.__finished = threading.Event()
+        self.__finish_time = None
+
+    @property
+    def finished(self):
+        return self.__finished
+
+    @property
+    def finish_time(self):
+        return self.__finish_time
+
     def set_status(self, status):
         self._status = status
 
+    def signal_finished(self):
+        if not self.__finished.is_set():
+            self.__finish_time = time.time()
+            self.__finished.set()
+
     def on_rendering_begin(self):
-        pass
+        self.__finished.clear()
+        self.__finish_time = None
 
     def on_rendering_success(self):
         logger.debug("Render finished")
+        self.signal_finished()
 
     def on_rendering_abort(self):
-        pass
+        self.signal_finished()
 
     def on_frame_begin(self):
         pass
@@ -59,21 +81,73 @@ class BaseRendererController(asr.IRendererController):
         pass
 
 
+class RenderStatusReporter(object):
+    """
+    Merges progress and stats updates and sends them to Blender at most once per interval.
+    """
+
+    def __init__(self, engine, tile_callback, min_interval):
+        self.__engine = engine
+        self.__tile_callback = tile_callback
+        self.__min_interval = min_interval
+
+        self.__lock = threading.Lock()
+        self.__last_update_time = 0.0
+        self.__last_progress = None
+        self.__last_stats = None
+
+    def update(self, force=False):
+        # Skip the update if another thread is already reporting.
+        if not self.__lock.acquire(blocking=force):
+            return
+
+        try:
+            now = time.time()
+            if not force and now - self.__last_update_time < self.__min_interval:
+                return
+
+            self.__last_update_time = now
+
+            progress = self.__tile_callback.progress
+            if progress != self.__last_progress:
+                self.__last_progress = progress
+                self.__engine.update_progress(progress)
+
+            render_stats = self.__tile_callback.render_stats
+            if render_stats != self.__last_stats:
+                self.__last_stats = list(render_stats)
+                self.__engine.update_stats(render_stats[0], render_stats[1])
+        finally:
+            self.__lock.release()
+
+
 class FinalRendererController(BaseRendererController):
-    def __init__(self, engine, tile_callback):
+    def __init__(self, engine, tile_callback, stats_interval=0.0):
         super(FinalRendererController, self).__init__()
         self.__engine = engine
         self.__tile_callback = tile_callback
+        self.__status_reporter = RenderStatusReporter(engine, tile_callback, stats_interval)
+
+    @property
+    def status_reporter(self):
+        return self.__status_reporter
 
     def get_status(self):
+        # Checked on every poll so aborting stays responsive.
         if self.__engine.test_break():
             return asr.IRenderControllerStatus.AbortRendering
 
-        render_stats = self.__tile_callback.render_stats
-        self.__engine.update_stats(render_stats[0], render_stats[1])
+        self.__status_reporter.update()
         return self._status
 
+    def signal_finished(self):
+        super(FinalRendererController, self).signal_finished()
+
+        # Wake up the render engine if it is waiting for tiles.
+        self.__tile_callback.wake()
+
     def on_rendering_begin(self):
+        super(FinalRendererController, self).on_rendering_begin()
         logger.debug("Starting Render")
         self.__engine.update_stats("appleseed Rendering: Loading scene", "Time Remaining: Unknown")
 
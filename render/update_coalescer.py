@@ -0,0 +1,138 @@
+#
+# This source file is part of appleseed.
+# Visit http://appleseedhq.net/ for additional information and resources.
+#
+# This software is released under the MIT license.
+#
+# Copyright (c) 2019 The appleseedhq Organization
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import time
+
+from ..logger import get_logger
+
+logger = get_logger()
+
+
+class UpdateRecord(object):
+    """
+    Depsgraph update for one datablock, merged across all notifications of a batch.
+    Mirrors the attributes of bpy.types.DepsgraphUpdate used by the scene translator.
+    """
+
+    def __init__(self, bl_id):
+        self.id = bl_id
+        self.is_updated_geometry = False
+        self.is_updated_shading = False
+        self.is_updated_transform = False
+
+    @property
+    def is_valid(self):
+        # The datablock may have been deleted since the update was recorded.
+        try:
+            self.id.name_full
+        except ReferenceError:
+            return False
+
+        return True
+
+    def merge(self, update):
+        self.is_updated_geometry |= update.is_updated_geometry
+        self.is_updated_shading |= update.is_updated_shading
+        self.is_updated_transform |= update.is_updated_transform
+
+
+class UpdateCoalescer(object):
+    """
+    Gathers depsgraph updates during interactive rendering so they can be applied as one batch.
+    Updates that cannot change the appleseed project are dropped when they are recorded.
+    """
+
+    def __init__(self, window):
+        self.__window = window
+
+        self.__records = dict()
+        self.__first_update_time = None
+
+        self.__received_updates = 0
+        self.__ignored_updates = 0
+
+    @property
+    def has_pending_updates(self):
+        return len(self.__records) > 0
+
+    @property
+    def is_ready(self):
+        """
+        True when there are pending updates and the gathering window has elapsed.
+        """
+
+        return self.has_pending_updates and time.time() - self.__first_update_time >= self.__window
+
+    @property
+    def remaining_time(self):
+        """
+        Seconds until the gathering window of the pending updates elapses.
+        """
+
+        if self.__first_update_time is None:
+            return self.__window
+
+        return max(0.0, self.__window - (time.time() - self.__first_update_time))
+
+    def add_updates(self, updates, is_relevant):
+        for update in updates:
+            self.__received_updates += 1
+
+            if not is_relevant(update):
+                self.__ignored_updates += 1
+                continue
+
+            bl_id = update.id.original
+
+            record = self.__records.get(bl_id)
+            if record is None:
+                record = UpdateRecord(bl_id)
+                self.__records[bl_id] = record
+
+            record.merge(update)
+
+        if self.__records and self.__first_update_time is None:
+            self.__first_update_time = time.time()
+
+    def take_updates(self):
+        """
+        Returns the pending updates and starts a new batch.
+        """
+
+        records = [record for record in self.__records.values() if record.is_valid]
+
+        logger.debug("appleseed: Applying %i coalesced updates (%i notifications received, %i ignored)",
+                     len(records),
+                     self.__received_updates,
+                     self.__ignored_updates)
+
+        self.__records = dict()
+        self.__first_update_time = None
+        self.__received_updates = 0
+        self.__ignored_updates = 0
+
+        return records
@@ -0,0 +1,119 @@
+#!/usr/bin/python
+
+#
+# This source file is part of appleseed.
+# Visit http://appleseedhq.net/ for additional information and resources.
+#
+# This software is released under the MIT license.
+#
+# Copyright (c) 2019 The appleseedhq Organization
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+"""
+Compares the cost of fingerprinting a mesh with the cost of converting it to appleseed.
+
+Run from Blender with the appleseed add-on installed and enabled:
+
+    blender -b --factory-startup --python scripts/benchmarks/mesh_fingerprint.py -- --subdivisions 8
+"""
+
+import argparse
+import sys
+import time
+
+import bpy
+
+
+#--------------------------------------------------------------------------------------------------
+# Benchmark.
+#--------------------------------------------------------------------------------------------------
+
+def create_mesh(subdivisions):
+    bpy.ops.mesh.primitive_ico_sphere_add(subdivisions=subdivisions)
+    obj = bpy.context.active_object
+    obj.data.uv_layers.new()
+
+    return obj
+
+
+def convert_mesh(asr, me):
+    me.calc_loop_triangles()
+
+    as_mesh = asr.MeshObject("benchmark", {})
+    as_mesh.push_material_slot("default")
+
+    asr.export_mesh_blender80(as_mesh,
+                              len(me.loop_triangles),
+                              me.loop_triangles[0].as_pointer(),
+                              len(me.loops),
+                              me.loops[0].as_pointer(),
+                              me.polygons[0].as_pointer(),
+                              me.vertices[0].as_pointer(),
+                              me.uv_layers.active.data[0].as_pointer(),
+                              False,
+                              True)
+
+
+def time_best(func, repeats):
+    best = float('inf')
+
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+
+    parser = argparse.ArgumentParser(description="benchmark mesh fingerprinting against mesh conversion.")
+    parser.add_argument("-s", "--subdivisions", type=int, default=7,
+                        help="subdivision level of the benchmark ico sphere")
+    parser.add_argument("-r", "--repeats", type=int, default=5,
+                        help="number of runs, the best time is reported")
+    args = parser.parse_args(argv)
+
+    bpy.ops.preferences.addon_enable(module="blenderseed")
+
+    import appleseed as asr
+    from blenderseed.utils.util import get_mesh_fingerprint
+
+    obj = create_mesh(args.subdivisions)
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    eval_object = obj.evaluated_get(depsgraph)
+    me = eval_object.to_mesh()
+
+    fingerprint_time = time_best(lambda: get_mesh_fingerprint(me), args.repeats)
+    convert_time = time_best(lambda: convert_mesh(asr, me), args.repeats)
+
+    print(f"Vertices:      {len(me.vertices)}")
+    print(f"Triangles:     {len(me.loop_triangles)}")
+    print(f"Fingerprint:   {fingerprint_time * 1000.0:.2f} ms")
+    print(f"Conversion:    {convert_time * 1000.0:.2f} ms")
+    print(f"Ratio:         {fingerprint_time / convert_time:.3f}")
+
+    eval_object.to_mesh_clear()
+
+
+if __name__ == '__main__':
+    main()
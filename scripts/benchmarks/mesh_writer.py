@@ -0,0 +1,126 @@
+#!/usr/bin/python
+
+#
+# This source file is part of appleseed.
+# Visit http://appleseedhq.net/ for additional information and resources.
+#
+# This software is released under the MIT license.
+#
+# Copyright (c) 2019 The appleseedhq Organization
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+"""
+Measures how binarymesh writing scales with the number of mesh writer threads.
+
+Run from Blender with the appleseed add-on installed and enabled:
+
+    blender -b --factory-startup --python scripts/benchmarks/mesh_writer.py -- --meshes 32 --subdivisions 7
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import bpy
+
+
+#--------------------------------------------------------------------------------------------------
+# Benchmark.
+#--------------------------------------------------------------------------------------------------
+
+def create_mesh(asr, subdivisions):
+    bpy.ops.mesh.primitive_ico_sphere_add(subdivisions=subdivisions)
+    obj = bpy.context.active_object
+    obj.data.uv_layers.new()
+
+    me = obj.data
+    me.calc_loop_triangles()
+
+    as_mesh = asr.MeshObject("benchmark", {})
+    as_mesh.push_material_slot("default")
+
+    asr.export_mesh_blender80(as_mesh,
+                              len(me.loop_triangles),
+                              me.loop_triangles[0].as_pointer(),
+                              len(me.loops),
+                              me.loops[0].as_pointer(),
+                              me.polygons[0].as_pointer(),
+                              me.vertices[0].as_pointer(),
+                              me.uv_layers.active.data[0].as_pointer(),
+                              False,
+                              True)
+
+    return as_mesh
+
+
+def write_meshes(MeshWriterPool, as_mesh, count, workers):
+    output_dir = tempfile.mkdtemp(prefix="appleseed_mesh_writer_")
+
+    try:
+        start = time.perf_counter()
+
+        with MeshWriterPool(max_workers=workers) as mesh_writer:
+            for index in range(count):
+                mesh_writer.write(as_mesh, os.path.join(output_dir, f"mesh_{index}.binarymesh"))
+
+        return time.perf_counter() - start
+    finally:
+        shutil.rmtree(output_dir)
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+
+    parser = argparse.ArgumentParser(description="benchmark binarymesh writing with different thread counts.")
+    parser.add_argument("-m", "--meshes", type=int, default=32,
+                        help="number of mesh files written per run")
+    parser.add_argument("-s", "--subdivisions", type=int, default=7,
+                        help="subdivision level of the benchmark ico sphere")
+    parser.add_argument("-w", "--max-workers", type=int, default=os.cpu_count(),
+                        help="largest number of writer threads")
+    args = parser.parse_args(argv)
+
+    bpy.ops.preferences.addon_enable(module="blenderseed")
+
+    import appleseed as asr
+    from blenderseed.translators.mesh_writer import MeshWriterPool
+
+    as_mesh = create_mesh(asr, args.subdivisions)
+
+    print(f"{'Workers':>8} {'Time':>12} {'Speedup':>8}")
+
+    serial_time = None
+    workers = 1
+    while workers <= args.max_workers:
+        write_time = write_meshes(MeshWriterPool, as_mesh, args.meshes, workers)
+        if serial_time is None:
+            serial_time = write_time
+
+        print(f"{workers:>8} {write_time * 1000.0:9.2f} ms {serial_time / write_time:8.2f}")
+
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main()
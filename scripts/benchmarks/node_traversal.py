@@ -0,0 +1,153 @@
+#!/usr/bin/python
+
+#
+# This source file is part of appleseed.
+# Visit http://appleseedhq.net/ for additional information and resources.
+#
+# This software is released under the MIT license.
+#
+# Copyright (c) 2019 The appleseedhq Organization
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+"""
+Measures node tree traversal on synthetic shading networks made of chained diamonds, where
+every diamond doubles the number of paths from the root to the first node.
+
+Run from Blender with the appleseed add-on installed and enabled:
+
+    blender -b --factory-startup --python scripts/benchmarks/node_traversal.py -- --max-depth 256
+"""
+
+import argparse
+import sys
+import time
+
+import bpy
+
+
+#--------------------------------------------------------------------------------------------------
+# Benchmark.
+#--------------------------------------------------------------------------------------------------
+
+def create_diamond_tree(depth):
+    """
+    Creates a node tree of depth diamonds, each one a node feeding two nodes that feed a third.
+    Returns the root node.
+    """
+
+    node_tree = bpy.data.node_groups.new(f"diamonds_{depth}", 'ShaderNodeTree')
+    nodes = node_tree.nodes
+    links = node_tree.links
+
+    top = nodes.new('ShaderNodeCombineRGB')
+
+    for _ in range(depth):
+        left = nodes.new('ShaderNodeCombineRGB')
+        right = nodes.new('ShaderNodeCombineRGB')
+        bottom = nodes.new('ShaderNodeCombineRGB')
+
+        links.new(top.outputs[0], left.inputs[0])
+        links.new(top.outputs[0], right.inputs[0])
+        links.new(left.outputs[0], bottom.inputs[0])
+        links.new(right.outputs[0], bottom.inputs[1])
+
+        top = bottom
+
+    return node_tree, top
+
+
+def naive_traversal(node, tree_list):
+    # The traversal used before memoization, followed by the quadratic duplicate removal.
+    for socket in node.inputs:
+        if socket.is_linked:
+            naive_traversal(socket.links[0].from_node, tree_list)
+
+    tree_list.append(node)
+
+    return tree_list
+
+
+def naive_filter(params):
+    filter_list = list()
+    for p in params:
+        if p not in filter_list:
+            filter_list.append(p)
+
+    return filter_list
+
+
+def time_best(func, repeats):
+    best = float('inf')
+
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+
+    parser = argparse.ArgumentParser(description="benchmark node tree traversal on diamond-shaped graphs.")
+    parser.add_argument("-d", "--max-depth", type=int, default=256,
+                        help="number of diamonds in the largest benchmark tree")
+    parser.add_argument("-n", "--naive-max-depth", type=int, default=12,
+                        help="largest tree also traversed with the previous algorithm")
+    parser.add_argument("-r", "--repeats", type=int, default=5,
+                        help="number of runs, the best time is reported")
+    args = parser.parse_args(argv)
+
+    bpy.ops.preferences.addon_enable(module="blenderseed")
+
+    from blenderseed.translators.nodetree import NodeTreeTranslator
+
+    print(f"{'Diamonds':>10} {'Nodes':>8} {'Traversal':>12} {'Per node':>12} {'Previous':>12}")
+
+    depth = 1
+    while depth <= args.max_depth:
+        node_tree, root = create_diamond_tree(depth)
+        translator = NodeTreeTranslator(node_tree, None, node_tree.name)
+
+        traverse = translator._NodeTreeTranslator__traverse_tree
+        tree_list = traverse(root, None)
+        assert len(tree_list) == len(node_tree.nodes)
+
+        traversal_time = time_best(lambda: traverse(root, None), args.repeats)
+
+        if depth <= args.naive_max_depth:
+            assert naive_filter(naive_traversal(root, list())) == tree_list
+            naive_time = time_best(lambda: naive_filter(naive_traversal(root, list())), args.repeats)
+            previous = f"{naive_time * 1000.0:9.3f} ms"
+        else:
+            previous = "-"
+
+        print(f"{depth:>10} {len(tree_list):>8} {traversal_time * 1000.0:9.3f} ms "
+              f"{traversal_time * 1e6 / len(tree_list):9.3f} us {previous:>12}")
+
+        bpy.data.node_groups.remove(node_tree)
+
+        depth *= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/python
+
+#
+# This source file is part of appleseed.
+# Visit http://appleseedhq.net/ for additional information and resources.
+#
+# This software is released under the MIT license.
+#
+# Copyright (c) 2019 The appleseedhq Organization
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+"""
+Exports a frame range of a .blend file to appleseed projects using several background Blender processes.
+
+The frame range is split into contiguous chunks, one per worker.  All workers write to the export path
+set in the file and share its _geometry directory, so meshes are written once no matter which worker
+exports them.  Each worker keeps its own incremental export manifest, the driver merges them into the
+manifest of the project once all workers are done.
+
+    python scripts/export_frames.py -t /path/to/blender -w 4 -s 1 -e 1000 shot.blend
+"""
+
+from __future__ import division
+from __future__ import print_function
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+
+#--------------------------------------------------------------------------------------------------
+# Constants.
+#--------------------------------------------------------------------------------------------------
+
+DEFAULT_TOOL_FILEPATH = "C:\\Program Files\\Blender Foundation\\Blender 2.82\\blender.exe" if os.name == "nt" else "./blender"
+
+PROGRESS_PREFIX = "APPLESEED_EXPORT_PROGRESS"
+
+
+#--------------------------------------------------------------------------------------------------
+# Worker, runs inside Blender.
+#--------------------------------------------------------------------------------------------------
+
+def run_worker(argv):
+    import bpy
+
+    parser = argparse.ArgumentParser(description="export a chunk of frames.")
+    parser.add_argument("--worker", type=int, required=True)
+    parser.add_argument("--frames", type=int, nargs=3, metavar=("START", "END", "STEP"), required=True)
+    args = parser.parse_args(argv)
+
+    bpy.ops.preferences.addon_enable(module="blenderseed")
+
+    from blenderseed.operators.export_ops import export_frames
+    from blenderseed.translators.export_manifest import ExportManifest
+    from blenderseed.translators.scene import SceneTranslator
+
+    start, end, step = args.frames
+
+    def report_progress(index, frame, elapsed):
+        print(f"{PROGRESS_PREFIX} {args.worker} {frame} {elapsed}")
+        sys.stdout.flush()
+
+    manifest_suffix = f".worker_{args.worker}"
+
+    stats = export_frames(bpy.context, range(start, end + 1, step), report_progress, manifest_suffix)
+
+    project_path = SceneTranslator.get_project_filename(bpy.context.scene.appleseed.export_path)
+    worker_manifest = ExportManifest.get_manifest_path(project_path + manifest_suffix)
+    project_manifest = ExportManifest.get_manifest_path(project_path)
+
+    # Paths are separated by tabs, they may contain spaces.
+    print(f"{PROGRESS_PREFIX} {args.worker} manifest\t{worker_manifest}\t{project_manifest}")
+    print(f"{PROGRESS_PREFIX} {args.worker} done {stats['written_bytes']} {stats['reused_bytes']}")
+    sys.stdout.flush()
+
+
+#--------------------------------------------------------------------------------------------------
+# Driver.
+#--------------------------------------------------------------------------------------------------
+
+class ExportProgress(object):
+    def __init__(self, frame_count):
+        self.lock = threading.Lock()
+        self.frame_count = frame_count
+        self.exported_frames = 0
+        self.written_bytes = 0
+        self.reused_bytes = 0
+
+    def frame_done(self, worker, frame, elapsed):
+        with self.lock:
+            self.exported_frames += 1
+            print(f"[{self.exported_frames}/{self.frame_count}] worker {worker} exported frame {frame} in {elapsed:.2f} s")
+            sys.stdout.flush()
+
+    def worker_done(self, written_bytes, reused_bytes):
+        with self.lock:
+            self.written_bytes += written_bytes
+            self.reused_bytes += reused_bytes
+
+
+def split_frames(start, end, step, workers):
+    frames = list(range(start, end + 1, step))
+    chunk_size = -(-len(frames) // workers)
+
+    # Contiguous chunks keep static meshes shared between the frames of a worker.
+    return [(chunk[0], chunk[-1], step) for chunk in
+            (frames[i:i + chunk_size] for i in range(0, len(frames), chunk_size))]
+
+
+def read_worker_output(worker, progress):
+    with open(worker['log_path'], "w") as log_file:
+        for line in worker['process'].stdout:
+            log_file.write(line)
+
+            if line.startswith(PROGRESS_PREFIX):
+                header, _, paths = line.rstrip("\n").partition("\t")
+                fields = header.split()
+                if fields[2] == "done":
+                    progress.worker_done(int(fields[3]), int(fields[4]))
+                elif fields[2] == "manifest":
+                    worker['manifest'], worker['project_manifest'] = paths.split("\t")
+                else:
+                    progress.frame_done(worker['id'], int(fields[2]), float(fields[3]))
+
+    worker['exit_code'] = worker['process'].wait()
+    worker['time'] = time.time() - worker['start_time']
+
+
+def merge_manifests(workers):
+    """
+    Writes the project manifest from the worker manifests.  Workers export increasing frame chunks,
+    so the entries of later workers describe the last exported state of each mesh.
+    """
+
+    workers = [worker for worker in workers if 'manifest' in worker and os.path.exists(worker['manifest'])]
+
+    if not workers:
+        return
+
+    manifest = None
+
+    for worker in workers:
+        with open(worker['manifest'], 'r') as manifest_file:
+            worker_manifest = json.load(manifest_file)
+
+        if manifest is None:
+            manifest = worker_manifest
+        else:
+            manifest['meshes'].update(worker_manifest['meshes'])
+
+    project_manifest = workers[0]['project_manifest']
+    temp_path = f"{project_manifest}.{os.getpid()}.tmp"
+
+    with open(temp_path, 'w') as manifest_file:
+        json.dump(manifest, manifest_file)
+    os.replace(temp_path, project_manifest)
+
+
+def run_driver(args):
+    chunks = split_frames(args.start, args.end, args.step, args.workers)
+    progress = ExportProgress(len(range(args.start, args.end + 1, args.step)))
+
+    print(f"Exporting {progress.frame_count} frames of {args.blend_file} with {len(chunks)} workers")
+
+    workers = list()
+
+    for worker_id, (start, end, step) in enumerate(chunks):
+        command = [args.tool_path, "-b", args.blend_file, "--python", os.path.abspath(__file__), "--",
+                   "--worker", str(worker_id), "--frames", str(start), str(end), str(step)]
+
+        worker = {'id': worker_id,
+                  'start': start,
+                  'end': end,
+                  'frame_count': len(range(start, end + 1, step)),
+                  'log_path': f"{os.path.splitext(args.blend_file)[0]}.export_worker_{worker_id}.log",
+                  'start_time': time.time(),
+                  'process': subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)}
+
+        worker['reader'] = threading.Thread(target=read_worker_output, args=(worker, progress))
+        worker['reader'].start()
+
+        workers.append(worker)
+
+    for worker in workers:
+        worker['reader'].join()
+
+    merge_manifests(workers)
+
+    print("\nWorker  Frames          Exit  Time (s)  Time per frame (s)")
+
+    for worker in workers:
+        print(f"{worker['id']:<6}  {worker['start']:>6}-{worker['end']:<6}  {worker['exit_code']:<4}  "
+              f"{worker['time']:>8.2f}  {worker['time'] / worker['frame_count']:>18.2f}")
+
+    failed = any(worker['exit_code'] != 0 for worker in workers)
+
+    print(f"\nExported {progress.exported_frames}/{progress.frame_count} frames, "
+          f"geometry written: {progress.written_bytes / (1024 * 1024):.2f} MB, "
+          f"deduplicated: {progress.reused_bytes / (1024 * 1024):.2f} MB")
+
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="export a frame range with several Blender processes.")
+    parser.add_argument("-t", "--tool-path", metavar="tool-path", default=DEFAULT_TOOL_FILEPATH,
+                        help="set the path to the Blender executable")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(),
+                        help="number of Blender processes")
+    parser.add_argument("-s", "--start", type=int, required=True, help="first frame")
+    parser.add_argument("-e", "--end", type=int, required=True, help="last frame")
+    parser.add_argument("--step", type=int, default=1, help="frame step")
+    parser.add_argument("blend_file", help="the .blend file to export, its export path must be set")
+    args = parser.parse_args()
+
+    sys.exit(run_driver(args))
+
+
+if __name__ == '__main__':
+    if "--" in sys.argv:
+        run_worker(sys.argv[sys.argv.index("--") + 1:])
+    else:
+        main()
@@ -31,6 +31,9 @@ from enum import Enum
 
 import bpy
 
+from .geometry_cache import GeometryIndex
+from .mesh_writer import MeshWriterPool
+from ..utils.osl_utils import get_bytecode_dir, get_compiled_shader
 from ..utils.path_util import get_cycles_shader_path, get_osl_search_paths
 
 
@@ -46,6 +49,9 @@ class AssetHandler(object):
     format for rendering
     """
 
+    # Script nodes use the compiled shaders of the OSL bytecode cache.
+    _use_bytecode_cache = True
+
     def __init__(self, depsgraph):
         self._searchpaths = get_osl_search_paths()
         self._cycles_osl_path = get_cycles_shader_path()
@@ -54,6 +60,9 @@ class AssetHandler(object):
         self._searchpaths.append(self._cycles_osl_path)
         self._searchpaths.extend(x.name for x in bpy.context.preferences.addons['blenderseed'].preferences.search_paths)
 
+        if self._use_bytecode_cache:
+            self._searchpaths.append(get_bytecode_dir())
+
     @property
     def searchpaths(self):
         return self._searchpaths
@@ -87,6 +96,23 @@ class AssetHandler(object):
 
         return archive_asset
 
+    def process_source_shader(self, source_code):
+        """
+        Returns the name of the compiled shader for OSL source code, or None if the source
+        should be added to the shader group as is.
+        """
+
+        if not self._use_bytecode_cache:
+            return None
+
+        shader_file = get_compiled_shader(source_code)
+
+        if shader_file is None:
+            return None
+
+        # The bytecode cache directory is already in the search paths.
+        return os.path.splitext(os.path.basename(shader_file))[0]
+
     def _convert_frame_number(self, file):
         base_filename, ext = os.path.splitext(file)
         index_1 = base_filename.find("%")
@@ -106,11 +132,17 @@ class CopyAssetsAssetHandler(AssetHandler):
     format for exported scene files.  It also copies texture assets into the correct output folder
     """
 
-    def __init__(self, export_dir, geometry_dir, textures_dir, depsgraph):
+    # Exported projects keep the script source so they do not depend on the local bytecode cache.
+    _use_bytecode_cache = False
+
+    def __init__(self, export_dir, geometry_dir, textures_dir, depsgraph, export_manifest=None):
         super(CopyAssetsAssetHandler, self).__init__(depsgraph)
         self.__export_dir = export_dir
         self.__geometry_dir = geometry_dir
         self.__textures_dir = textures_dir
+        self.__export_manifest = export_manifest
+        self.__geometry_index = GeometryIndex(geometry_dir)
+        self.__mesh_writer = MeshWriterPool()
 
     @property
     def export_dir(self):
@@ -124,6 +156,29 @@ class CopyAssetsAssetHandler(AssetHandler):
     def textures_dir(self):
         return self.__textures_dir
 
+    @property
+    def geometry_index(self):
+        return self.__geometry_index
+
+    @property
+    def mesh_writer(self):
+        return self.__mesh_writer
+
+    @property
+    def export_manifest(self):
+        return self.__export_manifest
+
+    def finish_export(self):
+        """
+        Waits for the geometry files still being written and saves the geometry index and export manifest.
+        """
+
+        self.__mesh_writer.join()
+        self.__geometry_index.save()
+
+        if self.__export_manifest is not None:
+            self.__export_manifest.save()
+
     def process_path(self, blend_path, asset_type, sub_texture=False):
         original_path = bpy.path.abspath(blend_path)
         if '%' in original_path:
@@ -138,7 +193,10 @@ class CopyAssetsAssetHandler(AssetHandler):
             dest_dir = self.textures_dir
             dest_file = os.path.join(dest_dir, filename)
             if not os.path.exists(dest_file):
-                shutil.copy(os.path.join(original_dir, filename), os.path.join(dest_dir, filename))
+                # Copy to a temporary file first, other exports may be copying the same texture.
+                temp_file = f"{dest_file}.{os.getpid()}.tmp"
+                shutil.copy(os.path.join(original_dir, filename), temp_file)
+                os.replace(temp_file, dest_file)
             return f"_textures/{filename}"
 
         else:
@@ -0,0 +1,126 @@
+#
+# This source file is part of appleseed.
+# Visit http://appleseedhq.net/ for additional information and resources.
+#
+# This software is released under the MIT license.
+#
+# Copyright (c) 2019 The appleseedhq Organization
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import json
+import os
+
+from ..logger import get_logger
+from ..utils.util import get_mesh_fingerprint
+
+logger = get_logger()
+
+
+class ExportManifest(object):
+    """
+    Records the fingerprints of the translated data of an exported project, next to the project file.
+
+    An incremental export compares against the manifest of the previous export and reuses the
+    geometry files of meshes whose fingerprint did not change, without evaluating them again.
+    """
+
+    version = 1
+
+    def __init__(self, project_path, geometry_dir):
+        self.__manifest_path = self.get_manifest_path(project_path)
+        self.__geometry_dir = geometry_dir
+
+        self.__previous_meshes = self.__load()
+        self.__meshes = dict()
+        self.__data_fingerprints = dict()
+
+        self.__reused_meshes = 0
+        self.__exported_meshes = 0
+
+    @staticmethod
+    def get_manifest_path(project_path):
+        return f"{project_path}.manifest.json"
+
+    def get_mesh_files(self, name, fingerprint):
+        """
+        Returns the geometry files exported for a mesh by the previous export if its fingerprint
+        is unchanged and the files still exist, or None otherwise.
+        """
+
+        entry = self.__meshes.get(name) or self.__previous_meshes.get(name)
+
+        if entry is None or entry['fingerprint'] != fingerprint:
+            return None
+
+        files = entry['files']
+
+        if not all(os.path.exists(os.path.join(self.__geometry_dir, filename)) for filename in files):
+            return None
+
+        self.__reused_meshes += 1
+        self.__meshes[name] = entry
+
+        return list(files)
+
+    def get_data_fingerprint(self, mesh_data):
+        """
+        Returns the fingerprint of a mesh datablock.  The vertices of a mesh datablock can't be
+        animated, so unless it has animated properties the fingerprint is computed once per export
+        and is shared by all frames of an animation export.
+        """
+
+        if mesh_data.animation_data is not None:
+            return get_mesh_fingerprint(mesh_data)
+
+        fingerprint = self.__data_fingerprints.get(mesh_data.name_full)
+
+        if fingerprint is None:
+            fingerprint = get_mesh_fingerprint(mesh_data)
+            self.__data_fingerprints[mesh_data.name_full] = fingerprint
+
+        return fingerprint
+
+    def set_mesh_files(self, name, fingerprint, files):
+        self.__exported_meshes += 1
+        self.__meshes[name] = {'fingerprint': fingerprint, 'files': list(files)}
+
+    def save(self):
+        # Only meshes of this export are kept, deleted objects drop out of the manifest.
+        temp_path = f"{self.__manifest_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as manifest_file:
+            json.dump({'version': self.version, 'meshes': self.__meshes}, manifest_file)
+        os.replace(temp_path, self.__manifest_path)
+
+        logger.debug("appleseed: Incremental export reused %d meshes, exported %d meshes",
+                     self.__reused_meshes,
+                     self.__exported_meshes)
+
+    def __load(self):
+        try:
+            with open(self.__manifest_path, 'r') as manifest_file:
+                manifest = json.load(manifest_file)
+        except (OSError, ValueError):
+            return dict()
+
+        if manifest.get('version') != self.version:
+            return dict()
+
+        return manifest.get('meshes', dict())
@@ -0,0 +1,232 @@
+#
+# This source file is part of appleseed.
+# Visit http://appleseedhq.net/ for additional information and resources.
+#
+# This software is released under the MIT license.
+#
+# Copyright (c) 2019 The appleseedhq Organization
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import json
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+
+from bpy.app.handlers import persistent
+
+import appleseed as asr
+
+from ..logger import get_logger
+
+logger = get_logger()
+
+
+class GeometryCache(object):
+    """
+    Keeps the meshes converted for final renders so that the next render can reuse
+    them instead of converting unchanged meshes again.
+
+    Meshes are stored as binarymesh files in a temporary directory, because appleseed
+    projects take ownership of their mesh objects and are destroyed after each render.
+    The least recently used meshes are evicted once the files exceed the size limit.
+    """
+
+    def __init__(self):
+        self.__entries = OrderedDict()
+        self.__cache_dir = None
+        self.__size = 0
+        self.__file_count = 0
+
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def hits(self):
+        return self.__hits
+
+    @property
+    def misses(self):
+        return self.__misses
+
+    @property
+    def size(self):
+        return self.__size
+
+    def read(self, key, mesh_name, params):
+        """
+        Returns the cached mesh for a key as a new mesh object, or None on a cache miss.
+        """
+
+        entry = self.__entries.get(key)
+
+        if entry is not None:
+            filename, _ = entry
+            mesh_params = dict(params)
+            mesh_params['filename'] = filename
+            mesh_objects = asr.MeshObjectReader.read([], mesh_name, mesh_params)
+
+            if len(mesh_objects) == 1:
+                self.__entries.move_to_end(key)
+                self.__hits += 1
+                return mesh_objects[0]
+
+            logger.debug("appleseed: Failed to read cached mesh %s", filename)
+            self.__remove(key)
+
+        self.__misses += 1
+
+        return None
+
+    def store(self, key, as_mesh, max_size):
+        """
+        Saves a converted mesh in the cache and evicts old meshes until the cache fits in max_size bytes.
+        """
+
+        if key in self.__entries:
+            self.__remove(key)
+
+        if self.__cache_dir is None:
+            self.__cache_dir = tempfile.mkdtemp(prefix="blenderseed_geometry_")
+
+        filename = os.path.join(self.__cache_dir, f"{self.__file_count}.binarymesh")
+        self.__file_count += 1
+        asr.MeshObjectWriter.write(as_mesh, "mesh", filename)
+
+        file_size = os.path.getsize(filename)
+        self.__entries[key] = (filename, file_size)
+        self.__size += file_size
+
+        while self.__size > max_size and self.__entries:
+            self.__remove(next(iter(self.__entries)))
+
+    def invalidate(self, obj_name):
+        """
+        Removes all cached meshes of an object.
+        """
+
+        for key in [key for key in self.__entries if key[0] == obj_name]:
+            self.__remove(key)
+
+    def invalidate_removed_objects(self, objects):
+        """
+        Removes the cached meshes of objects that were deleted or renamed.
+        """
+
+        obj_names = {obj.name_full for obj in objects}
+
+        for obj_name in {key[0] for key in self.__entries} - obj_names:
+            logger.debug("appleseed: Removing cached meshes of %s", obj_name)
+            self.invalidate(obj_name)
+
+    def clear(self):
+        self.__entries.clear()
+        self.__size = 0
+
+        if self.__cache_dir is not None:
+            shutil.rmtree(self.__cache_dir, ignore_errors=True)
+            self.__cache_dir = None
+
+    def log_stats(self):
+        logger.debug("appleseed: Geometry cache: %d hits, %d misses, %d meshes, %.2f MB",
+                     self.__hits,
+                     self.__misses,
+                     len(self.__entries),
+                     self.__size / (1024 * 1024))
+
+    def __remove(self, key):
+        filename, file_size = self.__entries.pop(key)
+        self.__size -= file_size
+
+        try:
+            os.remove(filename)
+        except OSError:
+            pass
+
+
+class GeometryIndex(object):
+    """
+    Sidecar index of an exported project's geometry directory, mapping mesh fingerprints
+    to the binarymesh files written for them, so that unchanged meshes can be re-exported
+    without converting them again.
+    """
+
+    index_filename = "geometry_index.json"
+
+    def __init__(self, geometry_dir):
+        self.__geometry_dir = geometry_dir
+        self.__index_path = os.path.join(geometry_dir, self.index_filename)
+        self.__entries = self.__load()
+        self.__new_entries = dict()
+
+    def get(self, key):
+        """
+        Returns the binarymesh filename exported for a fingerprint, or None if there is no valid file.
+        """
+
+        filename = self.__new_entries.get(key) or self.__entries.get(key)
+
+        if filename is not None and os.path.exists(os.path.join(self.__geometry_dir, filename)):
+            return filename
+
+        return None
+
+    def add(self, key, filename):
+        self.__new_entries[key] = filename
+
+    def save(self):
+        if not self.__new_entries:
+            return
+
+        # Merge with the index on disk, other exports may share the geometry directory.
+        entries = self.__load()
+        entries.update(self.__new_entries)
+
+        temp_path = f"{self.__index_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as index_file:
+            json.dump({'version': 1, 'meshes': entries}, index_file)
+        os.replace(temp_path, self.__index_path)
+
+        logger.debug("appleseed: Saved %d new meshes to geometry index %s", len(self.__new_entries), self.__index_path)
+
+        self.__entries = entries
+        self.__new_entries = dict()
+
+    def __load(self):
+        try:
+            with open(self.__index_path, 'r') as index_file:
+                index = json.load(index_file)
+        except (OSError, ValueError):
+            return dict()
+
+        if index.get('version') != 1:
+            return dict()
+
+        return index.get('meshes', dict())
+
+
+geometry_cache = GeometryCache()
+
+
+@persistent
+def clear_geometry_cache(_):
+    # Object names are only meaningful within a file.
+    geometry_cache.clear()
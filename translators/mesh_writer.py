@@ -0,0 +1,192 @@
+#
+# This source file is part of appleseed.
+# Visit http://appleseedhq.net/ for additional information and resources.
+#
+# This software is released under the MIT license.
+#
+# Copyright (c) 2019 The appleseedhq Organization
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import appleseed as asr
+
+from ..logger import get_logger
+from ..utils.util import Timer
+
+logger = get_logger()
+
+
+class MeshWriterPool(object):
+    """
+    Writes binarymesh files on worker threads while the scene translation continues.
+
+    The meshes waiting to be written are kept alive until their file is saved, so the
+    number of bytes in flight is bounded: write() blocks until enough pending meshes
+    have been saved.
+
+    The pool is a context manager, leaving it waits for the queued meshes, or cancels
+    them if an exception was raised.  See scripts/benchmarks/mesh_writer.py for the
+    speedup of each worker count.
+    """
+
+    def __init__(self, max_workers=None, max_pending_bytes=512 * 1024 * 1024):
+        self.__executor = ThreadPoolExecutor(max_workers=max_workers or min(4, os.cpu_count()),
+                                             thread_name_prefix="appleseed_mesh_writer")
+        self.__max_pending_bytes = max_pending_bytes
+
+        self.__condition = threading.Condition()
+        self.__pending_bytes = 0
+        self.__pending_paths = set()
+        self.__futures = list()
+
+        self.__written_files = 0
+        self.__written_bytes = 0
+        self.__reused_bytes = 0
+        self.__wait_time = 0.0
+
+    @property
+    def written_bytes(self):
+        return self.__written_bytes
+
+    @property
+    def reused_bytes(self):
+        return self.__reused_bytes
+
+    def write(self, as_mesh, mesh_abs_path):
+        """
+        Queues a mesh to be written to a binarymesh file.
+        Returns False if the file already exists or is already being written.
+        """
+
+        if mesh_abs_path in self.__pending_paths:
+            return False
+
+        if os.path.exists(mesh_abs_path):
+            self.reuse(mesh_abs_path)
+            return False
+
+        mesh_size = self.__estimate_size(as_mesh)
+
+        with self.__condition:
+            if self.__pending_bytes > 0 and self.__pending_bytes + mesh_size > self.__max_pending_bytes:
+                wait_timer = Timer()
+                self.__condition.wait_for(lambda: self.__pending_bytes == 0 or
+                                          self.__pending_bytes + mesh_size <= self.__max_pending_bytes)
+                wait_timer.stop()
+                self.__wait_time += wait_timer.elapsed()
+
+            self.__pending_bytes += mesh_size
+
+        self.__pending_paths.add(mesh_abs_path)
+        self.__futures.append(self.__executor.submit(self.__write, as_mesh, mesh_abs_path, mesh_size))
+
+        return True
+
+    def reuse(self, mesh_abs_path):
+        """
+        Records that an existing mesh file was referenced instead of being written again.
+        """
+
+        self.__reused_bytes += os.path.getsize(mesh_abs_path)
+
+    def join(self):
+        """
+        Waits until all queued meshes are written.  Errors raised by the writer threads are raised here.
+        """
+
+        join_timer = Timer()
+
+        try:
+            for future in self.__futures:
+                future.result()
+        finally:
+            self.__futures = list()
+            self.__pending_paths.clear()
+
+        join_timer.stop()
+
+        logger.debug("appleseed: Wrote %d mesh files (%.2f MB), reused %.2f MB, waited %f seconds for memory, %f seconds for writers",
+                     self.__written_files,
+                     self.__written_bytes / (1024 * 1024),
+                     self.__reused_bytes / (1024 * 1024),
+                     self.__wait_time,
+                     join_timer.elapsed())
+
+    def shutdown(self):
+        try:
+            self.join()
+        finally:
+            self.__executor.shutdown()
+
+    def cancel(self):
+        """
+        Drops the queued meshes that are not being written yet and stops the workers.
+        """
+
+        for future in self.__futures:
+            future.cancel()
+
+        self.__executor.shutdown()
+
+        self.__futures = list()
+        self.__pending_paths.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.shutdown()
+        else:
+            self.cancel()
+
+    def __write(self, as_mesh, mesh_abs_path, mesh_size):
+        # Write to a temporary file first so an interrupted export never leaves a truncated mesh behind.
+        base_path, ext = os.path.splitext(mesh_abs_path)
+        temp_path = f"{base_path}.{os.getpid()}.{threading.get_ident()}.tmp{ext}"
+
+        try:
+            asr.MeshObjectWriter.write(as_mesh, "mesh", temp_path)
+            os.replace(temp_path, mesh_abs_path)
+
+            with self.__condition:
+                self.__written_files += 1
+                self.__written_bytes += os.path.getsize(mesh_abs_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        finally:
+            with self.__condition:
+                self.__pending_bytes -= mesh_size
+                self.__condition.notify_all()
+
+    @staticmethod
+    def __estimate_size(as_mesh):
+        # In-memory size of the mesh data: positions, normals, tangents, texture coordinates and triangles.
+        return (as_mesh.get_vertex_count() * 12 +
+                as_mesh.get_vertex_normal_count() * 12 +
+                as_mesh.get_vertex_tangent_count() * 12 +
+                as_mesh.get_tex_coords_count() * 8 +
+                as_mesh.get_triangle_count() * 40) * (as_mesh.get_motion_segment_count() + 1)
@@ -27,15 +27,13 @@
 
 import os
 
-import bpy
-
 import appleseed as asr
 from .assethandlers import AssetType
 from .cycles_shaders import cycles_nodes, cycles_parameter_mapping, parse_cycles_shader
 from .translator import Translator
 from ..properties.nodes import AppleseedOSLNode
 from ..logger import get_logger
-from ..utils.util import filter_params
+from ..utils import osl_utils
 
 logger = get_logger()
 
@@ -86,7 +84,7 @@ class NodeTreeTranslator(Translator):
                 if node.node_type == 'osl_surface':
                     logger.debug(f"appleseed: Found surface shader for {self.__mat_name} node tree")
                     surface_shader = node
-                    self.__shader_list = filter_params(self.__traverse_tree(surface_shader, list(), engine))
+                    self.__shader_list = self.__traverse_tree(surface_shader, engine)
                     break
                 
         # Replaces a Cycles material node behind the scenes
@@ -99,7 +97,7 @@ class NodeTreeTranslator(Translator):
                         self._bl_obj.links.new(node_connection.from_socket, replacement_node.inputs[0])
                         self._bl_obj.links.remove(node_connection)
                         surface_shader = replacement_node
-                        self.__shader_list = filter_params(self.__traverse_tree(surface_shader, list(), engine))
+                        self.__shader_list = self.__traverse_tree(surface_shader, engine)
                         break
 
         if surface_shader is None:
@@ -141,16 +139,14 @@ class NodeTreeTranslator(Translator):
                     logger.debug(f"appleseed: Adding {node.name} shader to {self.__mat_name} node tree")
                     self.__as_shader_group.add_shader("shader", shader_file_name, node.name, parameters)
                 elif node.node_type == 'osl_script':
-                    script = node.script
-                    osl_path = bpy.path.abspath(script.filepath, library=script.library)
-                    if script.is_in_memory or script.is_dirty or script.is_modified or not os.path.exists(osl_path):
-                        source_code = script.as_string()
+                    source_code = osl_utils.get_script_source(node.script)
+                    shader_name = self._asset_handler.process_source_shader(source_code)
+                    if shader_name is not None:
+                        logger.debug(f"appleseed: Adding {node.name} compiled script shader to {self.__mat_name} node tree")
+                        self.__as_shader_group.add_shader("shader", shader_name, node.name, parameters)
                     else:
-                        code = open(osl_path, 'r')
-                        source_code = code.read()
-                        code.close()
-                    logger.debug(f"appleseed: Adding {node.name} source shader to {self.__mat_name} node tree")
-                    self.__as_shader_group.add_source_shader("shader", node.bl_idname, node.name, source_code, parameters)
+                        logger.debug(f"appleseed: Adding {node.name} source shader to {self.__mat_name} node tree")
+                        self.__as_shader_group.add_source_shader("shader", node.bl_idname, node.name, source_code, parameters)
                 
                 for output in node.outputs:
                     if output.is_linked:
@@ -201,16 +197,30 @@ class NodeTreeTranslator(Translator):
 
         self.__as_shader_group.add_shader("surface", surface_shader_file, surface_shader.name, {})
 
-    def __traverse_tree(self, node, tree_list, engine):
+    def __traverse_tree(self, node, engine):
+        """
+        Returns the nodes upstream of node, each node listed once and after all of its inputs.
+        """
+
+        tree_list = list()
+        self.__visit_node(node, tree_list, set(), engine)
+
+        return tree_list
+
+    def __visit_node(self, node, tree_list, visited, engine):
+        # Nodes shared by several downstream nodes are only walked once.
+        visited.add(node)
+
         for socket in node.inputs:
             if socket.is_linked:
                 linked_node = socket.links[0].from_node
+                if linked_node in visited:
+                    continue
                 if linked_node.bl_idname in cycles_nodes.keys() or isinstance(linked_node, AppleseedOSLNode):
-                    self.__traverse_tree(linked_node, tree_list, engine)
+                    self.__visit_node(linked_node, tree_list, visited, engine)
                 else:
+                    visited.add(linked_node)
                     logger.error(f"Node {linked_node.name} is not a node compatible with appleseed, stopping traversal")
                     engine.report({'ERROR'}, f"Node {linked_node.name} is not a node compatible with appleseed, stopping traversal")
 
         tree_list.append(node)
-        
-        return tree_list
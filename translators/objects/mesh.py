@@ -25,13 +25,15 @@
 # THE SOFTWARE.
 #
 
+import hashlib
 import os
 
 import appleseed as asr
+from ..geometry_cache import geometry_cache
 from ..translator import Translator
 from ..utilites import ProjectExportMode
 from ...logger import get_logger
-from ...utils.util import is_object_deforming, Timer
+from ...utils.util import fingerprint_properties, get_mesh_fingerprint, is_object_deforming, Timer
 
 logger = get_logger()
 
@@ -61,6 +63,8 @@ class MeshTranslator(Translator):
 
         self.__mesh_filenames = list()
 
+        self.__cached_mesh_name = None
+
         self.__is_deforming = bl_obj.appleseed.use_deformation_blur and is_object_deforming(bl_obj)
 
         self._bl_obj.appleseed.obj_name = self._bl_obj.name_full
@@ -77,29 +81,90 @@ class MeshTranslator(Translator):
     def instances_size(self):
         return len(self.__instance_lib)
 
+    def get_shared_mesh_key(self, depsgraph):
+        """
+        Returns a key that is equal for objects whose converted mesh and object instance are identical,
+        or None if the mesh of this object can't be shared with other objects.
+        """
+
+        if self.__export_mode == ProjectExportMode.INTERACTIVE_RENDER or self.__is_deforming:
+            return None
+
+        mesh_data = self._bl_obj.data.original
+
+        if len(self._bl_obj.modifiers) == 0:
+            # Linked duplicates evaluate to the same mesh.
+            mesh_key = mesh_data
+        elif mesh_data.users < 2:
+            # Evaluating and hashing the mesh only pays off when other objects use the same data.
+            return None
+        else:
+            eval_object = self._bl_obj.evaluated_get(depsgraph)
+            mesh_key = (get_mesh_fingerprint(eval_object.to_mesh()), fingerprint_properties(mesh_data.appleseed))
+            eval_object.to_mesh_clear()
+
+        material_slots = tuple((slot.material.original, slot.material.use_nodes) if slot.material is not None else None
+                               for slot in self._bl_obj.material_slots)
+
+        return mesh_key, material_slots, fingerprint_properties(self._bl_obj.appleseed, skip=('obj_name',))
+
     def create_entities(self, depsgraph, num_def_times):
         logger.debug(f"appleseed: Creating mesh entity for {self.orig_name}")
         self.__mesh_params = self.__get_mesh_params()
 
-        self.__as_mesh = asr.MeshObject(self.orig_name, self.__mesh_params)
-
         self.__as_mesh_inst_params = self.__get_mesh_inst_params()
 
         self.__front_materials, self.__back_materials = self.__get_material_mappings()
 
+        # Incremental exports reuse the geometry files of meshes that did not change since the last export.
+        manifest = self._asset_handler.export_manifest if self.__export_mode == ProjectExportMode.PROJECT_EXPORT else None
+        manifest_key = self.__get_manifest_key(manifest) if manifest is not None and not self.__is_deforming else None
+
+        if manifest_key is not None:
+            mesh_filenames = manifest.get_mesh_files(self.orig_name, manifest_key)
+
+            if mesh_filenames is not None:
+                logger.debug("appleseed: Reusing exported geometry of unchanged mesh %s", self.orig_name)
+                self.__as_mesh = asr.MeshObject(self.orig_name, self.__mesh_params)
+                self.__mesh_filenames = mesh_filenames
+                for mesh_filename in mesh_filenames:
+                    self._asset_handler.mesh_writer.reuse(os.path.join(self.__geom_dir, mesh_filename))
+                return
+
         eval_object = self._bl_obj.evaluated_get(depsgraph)
 
         me = eval_object.to_mesh()
 
-        self.__convert_mesh(me)
+        # Meshes of final renders can be reused by the next render.
+        max_cache_size = depsgraph.scene_eval.appleseed.geometry_cache_size * 1024 * 1024
+        use_cache = self.__export_mode == ProjectExportMode.FINAL_RENDER and not self.__is_deforming and max_cache_size > 0
+        cache_key = self.__get_cache_key(me) if use_cache else None
 
-        if self.__export_mode == ProjectExportMode.PROJECT_EXPORT:
-            logger.debug(f"appleseed: Writing mesh file object {self.orig_name}, time = 0")
-            self.__write_mesh(self.orig_name)
+        self.__as_mesh = geometry_cache.read(cache_key, self.orig_name, self.__mesh_params) if use_cache else None
+
+        if self.__as_mesh is not None:
+            logger.debug("appleseed: Reusing cached mesh for %s", self.orig_name)
+            self.__cached_mesh_name = self.__as_mesh.get_name()
+        else:
+            self.__as_mesh = asr.MeshObject(self.orig_name, self.__mesh_params)
+
+            if self.__export_mode == ProjectExportMode.PROJECT_EXPORT:
+                logger.debug(f"appleseed: Writing mesh file object {self.orig_name}, time = 0")
+                self.__export_mesh(me)
+            else:
+                self.__convert_mesh(me)
+
+                if use_cache:
+                    geometry_cache.store(cache_key, self.__as_mesh, max_cache_size)
 
         eval_object.to_mesh_clear()
 
-        if self.__is_deforming:
+        if manifest_key is not None:
+            manifest.set_mesh_files(self.orig_name, manifest_key, self.__mesh_filenames)
+
+        # Exported meshes may still be queued for writing, and flush_entities replaces
+        # them by a mesh referencing one file per motion pose.
+        if self.__is_deforming and self.__export_mode != ProjectExportMode.PROJECT_EXPORT:
             self.__as_mesh.set_motion_segment_count(num_def_times - 1)
 
     def add_instance_step(self, time, instance_id, bl_matrix):
@@ -113,8 +178,7 @@ class MeshTranslator(Translator):
         if self.__export_mode == ProjectExportMode.PROJECT_EXPORT:
             logger.debug(f"appleseed: Writing mesh file object {self.orig_name}, time = {time}")
 
-            self.__convert_mesh(me)
-            self.__write_mesh(self.orig_name)
+            self.__export_mesh(me)
         else:
             self.__set_mesh_key(me, index)
 
@@ -377,6 +441,34 @@ class MeshTranslator(Translator):
                                        vertex_pointer,
                                        do_normals)
 
+    def __export_mesh(self, me):
+        # Meshes exported before with the same fingerprint reuse the existing binarymesh file.
+        geometry_index = self._asset_handler.geometry_index
+        export_key = self.__get_export_key(me)
+
+        mesh_filename = geometry_index.get(export_key)
+
+        if mesh_filename is not None:
+            logger.debug("appleseed: Skipping conversion of unchanged mesh %s, using %s", self.orig_name, mesh_filename)
+            self.__mesh_filenames.append(mesh_filename)
+            self._asset_handler.mesh_writer.reuse(os.path.join(self.__geom_dir, mesh_filename))
+            return
+
+        # The previous mesh may still be queued for writing, so every export gets a new mesh object.
+        self.__as_mesh = asr.MeshObject(self.orig_name, self.__mesh_params)
+
+        self.__convert_mesh(me)
+        mesh_filename = self.__write_mesh(self.orig_name)
+
+        geometry_index.add(export_key, mesh_filename)
+
+    def __get_export_key(self, me):
+        mesh_data = self._bl_obj.data
+
+        export_settings = (fingerprint_properties(mesh_data.appleseed), len(self._bl_obj.material_slots))
+
+        return hashlib.blake2b(repr((get_mesh_fingerprint(me), export_settings)).encode(), digest_size=16).hexdigest()
+
     def __write_mesh(self, mesh_name):
         # Compute tangents if needed.
         if self._bl_obj.data.appleseed.smooth_tangents and self._bl_obj.data.appleseed.export_uvs:
@@ -404,14 +496,41 @@ class MeshTranslator(Translator):
         # Write the binarymesh file.
         mesh_abs_path = os.path.join(self.__geom_dir, mesh_filename)
 
-        if not os.path.exists(mesh_abs_path):
+        if self._asset_handler.mesh_writer.write(self.__as_mesh, mesh_abs_path):
             logger.debug("appleseed: Writing mesh for object %s to %s", mesh_name, mesh_abs_path)
-            asr.MeshObjectWriter.write(self.__as_mesh, "mesh", mesh_abs_path)
         else:
             logger.debug("appleseed: Skipping already saved mesh file for mesh %s", mesh_name)
 
+        return mesh_filename
+
+    def __get_manifest_key(self, manifest):
+        mesh_data = self._bl_obj.data
+
+        # Without modifiers and shape keys the evaluated mesh equals the mesh datablock, which can be
+        # fingerprinted without evaluating the object.  Fingerprinting custom normals computes them
+        # in place, which must not happen on the user's mesh, so those meshes are evaluated.
+        if len(self._bl_obj.modifiers) > 0 or mesh_data.shape_keys is not None or mesh_data.has_custom_normals:
+            return None
+
+        export_settings = (fingerprint_properties(mesh_data.appleseed), len(self._bl_obj.material_slots))
+
+        return hashlib.blake2b(repr((manifest.get_data_fingerprint(mesh_data), export_settings)).encode(), digest_size=16).hexdigest()
+
+    def __get_cache_key(self, me):
+        mesh_data = self._bl_obj.data
+
+        return (self.orig_name,
+                get_mesh_fingerprint(me),
+                tuple(fingerprint_properties(modifier) for modifier in self._bl_obj.modifiers),
+                fingerprint_properties(mesh_data.appleseed),
+                len(self._bl_obj.material_slots))
+
     def __object_instance_mesh_name(self, mesh_name):
+        if self.__cached_mesh_name is not None:
+            return self.__cached_mesh_name
+
         if self.__export_mode == ProjectExportMode.PROJECT_EXPORT:
             return f"{mesh_name}.mesh"
 
         return mesh_name
+
@@ -33,9 +33,12 @@ import bpy
 import appleseed as asr
 from .assethandlers import AssetHandler, CopyAssetsAssetHandler
 from .cameras import InteractiveCameraTranslator, RenderCameraTranslator
+from .export_manifest import ExportManifest
+from .geometry_cache import geometry_cache
 from .material import MaterialTranslator
 from .objects import ArchiveAssemblyTranslator, MeshTranslator, LampTranslator
 from .textures import TextureTranslator
+from .update_filter import UpdateFilter
 from .utilites import ProjectExportMode
 from .world import WorldTranslator
 from ..logger import get_logger
@@ -51,7 +54,19 @@ class SceneTranslator(object):
 
     # Constructors.
     @classmethod
-    def create_project_export_translator(cls, depsgraph):
+    def create_project_export_translator(cls, depsgraph, asset_handler=None):
+        # Several exports can share an asset handler, and with it the geometry store.
+        if asset_handler is None:
+            asset_handler = cls.create_export_asset_handler(depsgraph)
+
+        logger.debug("Creating project export scene translator, filename: %s", depsgraph.scene_eval.appleseed.export_path)
+
+        return cls(export_mode=ProjectExportMode.PROJECT_EXPORT,
+                   selected_only=depsgraph.scene.appleseed.export_selected,
+                   asset_handler=asset_handler)
+
+    @classmethod
+    def create_export_asset_handler(cls, depsgraph, incremental=None, manifest_suffix=None):
         project_dir = os.path.dirname(depsgraph.scene_eval.appleseed.export_path)
 
         logger.debug("Creating texture and geometry directories in %s", project_dir)
@@ -65,13 +80,16 @@ class SceneTranslator(object):
         if not os.path.exists(textures_dir):
             os.makedirs(textures_dir)
 
-        logger.debug("Creating project export scene translator, filename: %s", depsgraph.scene_eval.appleseed.export_path)
+        if incremental is None:
+            incremental = depsgraph.scene_eval.appleseed.export_incremental
 
-        asset_handler = CopyAssetsAssetHandler(project_dir, geometry_dir, textures_dir, depsgraph)
+        export_manifest = None
+        if incremental:
+            # Exports running in parallel keep separate manifests, told apart by their suffix.
+            manifest_project = cls.get_project_filename(depsgraph.scene_eval.appleseed.export_path) + (manifest_suffix or "")
+            export_manifest = ExportManifest(manifest_project, geometry_dir)
 
-        return cls(export_mode=ProjectExportMode.PROJECT_EXPORT,
-                   selected_only=depsgraph.scene.appleseed.export_selected,
-                   asset_handler=asset_handler)
+        return CopyAssetsAssetHandler(project_dir, geometry_dir, textures_dir, depsgraph, export_manifest)
 
     @classmethod
     def create_final_render_translator(cls, depsgraph):
@@ -130,6 +148,16 @@ class SceneTranslator(object):
         self.__deform_times = {0.0}
 
         # Interactive tools.
+        self.__update_filter = UpdateFilter() if export_mode == ProjectExportMode.INTERACTIVE_RENDER else None
+
+        # Instance index: source object -> instancer objects (None for the object itself),
+        # and the instance id of objects placed directly in the scene.
+        self.__instancers = dict()
+        self.__direct_instance_ids = dict()
+
+        # Collection -> translated objects linked to it, used to find deleted objects.
+        self.__collection_members = dict()
+
         self.__viewport_resolution = None
         self.__current_frame = None
 
@@ -201,42 +229,45 @@ class SceneTranslator(object):
         materials_to_add = dict()
         textures_to_add = dict()
 
-        for obj in bpy.data.objects:
-            if obj.type == 'LIGHT':
-                objects_to_add[obj] = LampTranslator(obj, self.__export_mode, self.__asset_handler)
-            elif obj.type == 'MESH' and len(obj.data.loops) > 0:
-                objects_to_add[obj] = MeshTranslator(obj, self.__export_mode, self.__asset_handler)
-            elif obj.type == 'EMPTY' and obj.appleseed.object_export == "archive_assembly":
-                objects_to_add[obj] = ArchiveAssemblyTranslator(obj, self.__asset_handler)
+        # Create camera and world entities
+        self.__as_camera_translator.create_entities(depsgraph, context, engine)
+
+        if self.__as_world_translator is not None:
+            self.__as_world_translator.create_entities(depsgraph)
+
+        # Create translators for rendered objects and set their initial positions
+        self.__calc_initial_positions(depsgraph, engine, objects_to_add)
+
+        logger.debug("appleseed: Translating %d of %d objects", len(objects_to_add), len(bpy.data.objects))
 
-        for mat in bpy.data.materials:
+        # Only materials and images used by the rendered objects, the world and the camera are exported
+        for mat in self.__get_used_materials(objects_to_add.keys()):
             materials_to_add[mat] = MaterialTranslator(mat, self.__asset_handler)
 
-        for tex in bpy.data.images:
-            if tex.users > 0 and tex.name not in ("Render Result", "Viewer Node"):
-                textures_to_add[tex] = TextureTranslator(tex, self.__asset_handler)
+        if self.__export_mode == ProjectExportMode.INTERACTIVE_RENDER:
+            # Interactive updates do not create textures, so every image has to be available up front.
+            images = (tex for tex in bpy.data.images if tex.users > 0)
+        else:
+            images = self.__get_used_images(depsgraph, objects_to_add.keys())
 
-        # Create camera, world, material and texture entities
-        self.__as_camera_translator.create_entities(depsgraph, context, engine)
+        for tex in images:
+            if tex.name not in ("Render Result", "Viewer Node"):
+                textures_to_add[tex] = TextureTranslator(tex, self.__asset_handler)
 
-        if self.__as_world_translator is not None:
-            self.__as_world_translator.create_entities(depsgraph)
+        logger.debug("appleseed: Translating %d of %d materials and %d of %d images",
+                     len(materials_to_add),
+                     len(bpy.data.materials),
+                     len(textures_to_add),
+                     len(bpy.data.images))
 
+        # Create material and texture entities
         for obj, trans in materials_to_add.items():
             trans.create_entities(depsgraph, engine)
         for obj, trans in textures_to_add.items():
             trans.create_entities(depsgraph)
 
-        # Set initial position of all objects and lamps
-        self.__calc_initial_positions(depsgraph, engine, objects_to_add)
-
-        # Remove unused translators
-        for translator in list(objects_to_add.keys()):
-            if objects_to_add[translator].instances_size == 0:
-                del objects_to_add[translator]
-
         # Create 3D entities
-        for obj, trans in objects_to_add.items():
+        for trans in self.__unique_translators(objects_to_add):
             trans.create_entities(depsgraph, len(self.__deform_times))
 
         # Calculate additional steps for motion blur
@@ -247,7 +278,7 @@ class SceneTranslator(object):
         if self.__as_world_translator is not None:
             self.__as_world_translator.flush_entities(self.as_scene, self.as_main_assembly, self.as_project)
 
-        for obj, trans in objects_to_add.items():
+        for trans in self.__unique_translators(objects_to_add):
             trans.flush_entities(self.as_scene, self.as_main_assembly, self.as_project)
         for obj, trans in materials_to_add.items():
             trans.flush_entities(self.as_scene, self.as_main_assembly, self.as_project)
@@ -264,6 +295,25 @@ class SceneTranslator(object):
 
         self.__load_searchpaths()
 
+        if self.__update_filter is not None:
+            for bl_id in self.__as_object_translators.keys():
+                self.__update_filter.track(bl_id)
+            for bl_id in self.__as_material_translators.keys():
+                self.__update_filter.track(bl_id)
+            if depsgraph.scene_eval.world is not None:
+                self.__update_filter.track(depsgraph.scene_eval.world)
+            self.__update_filter.track(depsgraph.scene_eval)
+
+        if self.__export_mode == ProjectExportMode.INTERACTIVE_RENDER:
+            self.__index_collections(self.__as_object_translators.keys())
+
+        if self.__export_mode == ProjectExportMode.FINAL_RENDER:
+            if depsgraph.scene_eval.appleseed.geometry_cache_size > 0:
+                geometry_cache.invalidate_removed_objects(bpy.data.objects)
+                geometry_cache.log_stats()
+            else:
+                geometry_cache.clear()
+
         prof_timer.stop()
         logger.debug("Scene translated in %f seconds.", prof_timer.elapsed())
 
@@ -281,18 +331,53 @@ class SceneTranslator(object):
 
         engine.frame_set(current_frame, subframe=0.0)
 
-    def update_scene(self, depsgraph, engine):
+    def is_update_relevant(self, update):
+        """
+        Returns False for depsgraph updates that cannot change the appleseed project,
+        such as selection or UI changes.
+        """
+
+        bl_id = update.id
+
+        if isinstance(bl_id, (bpy.types.Material, bpy.types.Collection)):
+            return True
+        elif isinstance(bl_id, bpy.types.Object):
+            if bl_id.original in self.__as_object_translators:
+                return update.is_updated_geometry or update.is_updated_transform
+
+            return bl_id.type in ('MESH', 'LIGHT')
+        elif isinstance(bl_id, bpy.types.World):
+            return self.__as_world_translator is not None
+        elif isinstance(bl_id, bpy.types.Scene):
+            # Only adding or removing the world is handled for scene updates.
+            return (bl_id.world is None) != (self.__as_world_translator is None)
+
+        return False
+
+    def update_scene(self, depsgraph, engine, updates=None):
+        """
+        Applies depsgraph updates to the interactive project.
+        :param updates: Coalesced updates to apply instead of depsgraph.updates.
+        """
+
         objects_to_add = dict()
         materials_to_add = dict()
 
         object_updates = list()
 
-        check_for_deletions = False
+        updated_collections = set()
+
+        recreate_instances = set()
 
-        recreate_instances = list()
+        if updates is None:
+            updates = depsgraph.updates
 
         # Check for updated datablocks.
-        for update in depsgraph.updates:
+        for update in updates:
+            # Skip datablocks whose translated properties did not change.
+            if self.__update_filter is not None and not self.__update_filter.has_changed(update):
+                continue
+
             # This one is easy.
             if isinstance(update.id, bpy.types.Material):
                 if update.id.original in self.__as_material_translators.keys():
@@ -308,7 +393,7 @@ class SceneTranslator(object):
                             self.__as_object_translators[update.id.original].update_obj_instance()
                             object_updates.append(update.id.original)
                         if update.is_updated_transform:
-                            recreate_instances.append(update.id.original)
+                            recreate_instances.add(update.id.original)
                     else:
                         objects_to_add[update.id.original] = MeshTranslator(update.id.original,
                                                                             self.__export_mode,
@@ -321,9 +406,9 @@ class SceneTranslator(object):
                                                                                          self.as_scene,
                                                                                          self.__project)
                             object_updates.append(update.id.original)
-                            recreate_instances.append(update.id.original)
+                            recreate_instances.add(update.id.original)
                         if update.is_updated_transform:
-                            recreate_instances.append(update.id.original)
+                            recreate_instances.add(update.id.original)
                     else:
                         objects_to_add[update.id.original] = LampTranslator(update.id.original,
                                                                             self.__export_mode,
@@ -335,7 +420,7 @@ class SceneTranslator(object):
                             self.__as_object_translators[update.id.original].update_archive_ass(depsgraph)
                             object_updates.append(update.id.original)
                         if update.is_updated_transform:
-                            recreate_instances.append(update.id.original)
+                            recreate_instances.add(update.id.original)
             elif isinstance(update.id, bpy.types.World):
                 self.__as_world_translator.update_world(self.as_scene, depsgraph)
             elif isinstance(update.id, bpy.types.Scene):
@@ -352,29 +437,48 @@ class SceneTranslator(object):
                                                               self.as_main_assembly,
                                                               self.as_project)
             elif isinstance(update.id, bpy.types.Collection):
-                check_for_deletions = True
+                updated_collections.add(update.id.original)
 
         # Now we figure out which objects have particle systems that need to have their instances recreated.
+        particle_instances = set()
         for obj in object_updates:
-            if len(obj.particle_systems) > 0:
-                for system in obj.particle_systems:
-                    if system.settings.render_type == 'OBJECT':
-                        recreate_instances.append(system.settings.instance_object.original)
-                    elif system.settings.render_type == 'COLLECTION':
-                        for other_obj in system.settings.instance_collection.objects:
-                            if other_obj.type in ('MESH', 'LIGHT') and other_obj.original not in recreate_instances:
-                                recreate_instances.append(other_obj.original)
+            for system in obj.particle_systems:
+                if system.settings.render_type == 'OBJECT':
+                    particle_instances.add(system.settings.instance_object.original)
+                elif system.settings.render_type == 'COLLECTION':
+                    particle_instances.update(other_obj.original for other_obj in system.settings.instance_collection.objects
+                                              if other_obj.type in ('MESH', 'LIGHT'))
+
+        recreate_instances |= particle_instances
+
+        # Materials are only translated when used, so newly assigned ones have to be created here.
+        for mat in self.__get_used_materials(obj for obj in object_updates + list(objects_to_add.keys()) if obj.type == 'MESH'):
+            if mat not in self.__as_material_translators and mat not in materials_to_add:
+                materials_to_add[mat] = MaterialTranslator(mat, self.__asset_handler)
 
         for obj in recreate_instances:
             self.__as_object_translators[obj].clear_instances(self.as_main_assembly)
 
-        for inst in depsgraph.object_instances:
-            if inst.show_self:
-                obj, inst_id = self.__get_instance_data(inst)
-                if obj in recreate_instances:
-                    self.__as_object_translators[obj].add_instance_step(0.0, inst_id, inst.matrix_world)
-                elif obj in objects_to_add.keys():
-                    objects_to_add[obj].add_instance_step(0.0, inst_id, inst.matrix_world)
+        if not objects_to_add and not particle_instances and all(self.__instancers.get(obj) == {None} for obj in recreate_instances):
+            # Only objects placed directly in the scene changed, so their instances
+            # can be rebuilt without walking every instance in the depsgraph.
+            for obj in recreate_instances:
+                self.__as_object_translators[obj].add_instance_step(0.0,
+                                                                    self.__direct_instance_ids[obj],
+                                                                    obj.evaluated_get(depsgraph).matrix_world)
+        else:
+            for obj in recreate_instances:
+                self.__clear_instance_index(obj)
+
+            for inst in depsgraph.object_instances:
+                if inst.show_self:
+                    obj, inst_id = self.__get_instance_data(inst)
+                    if obj in recreate_instances:
+                        self.__as_object_translators[obj].add_instance_step(0.0, inst_id, inst.matrix_world)
+                        self.__index_instance(obj, inst, inst_id)
+                    elif obj in objects_to_add:
+                        objects_to_add[obj].add_instance_step(0.0, inst_id, inst.matrix_world)
+                        self.__index_instance(obj, inst, inst_id)
 
         # Create new materials.
         for mat in materials_to_add.values():
@@ -395,17 +499,30 @@ class SceneTranslator(object):
             trans.flush_entities(self.as_scene, self.as_main_assembly, self.as_project)
             self.__as_object_translators[bl_obj] = trans
 
+        self.__index_collections(objects_to_add.keys())
+
         # Check if any objects were deleted.
-        if check_for_deletions:
-            obj_list = list(self.__as_object_translators.keys())
+        # Deleted collections send no update, all of their members may have been deleted with them.
+        deleted_collections = [coll for coll in self.__collection_members if not self.__is_collection_alive(coll)]
 
-            for obj in obj_list:
-                try:
-                    if obj.name_full in bpy.data.objects or obj.name_full in bpy.data.lights:
-                        continue
-                except:
-                    self.__as_object_translators[obj].delete_object(self.as_main_assembly)
-                    del self.__as_object_translators[obj]
+        for coll in deleted_collections:
+            self.__delete_removed_objects(self.__collection_members.pop(coll))
+            updated_collections.discard(coll)
+
+        # Otherwise only objects that left an updated collection can have been deleted.
+        for coll in updated_collections:
+            members = {obj.original for obj in coll.objects if obj.original in self.__as_object_translators}
+            removed = self.__collection_members.get(coll, set()) - members
+            self.__collection_members[coll] = members
+
+            self.__delete_removed_objects(removed)
+
+        if updated_collections or deleted_collections:
+            logger.debug("appleseed: Checked %d collections for deleted objects",
+                         len(updated_collections) + len(deleted_collections))
+
+        if self.__update_filter is not None:
+            self.__update_filter.log_stats()
 
     def check_view_window(self, depsgraph, context):
         # Check if any camera parameters have changed (location, model, etc...)
@@ -443,13 +560,26 @@ class SceneTranslator(object):
 
     # Interactive update functions.
     def write_project(self, export_path):
+        # Wait for the binarymesh files still being written.
+        if self.__export_mode == ProjectExportMode.PROJECT_EXPORT:
+            self.__asset_handler.finish_export()
+
         # Export project files.
-        filename = os.path.abspath(bpy.path.ensure_ext(bpy.path.abspath(export_path), '.appleseed'))
+        filename = self.get_project_filename(export_path)
 
         asr.ProjectFileWriter().write(self.__project,
                                       filename,
                                       asr.ProjectFileWriterOptions.OmitWritingGeometryFiles | asr.ProjectFileWriterOptions.OmitHandlingAssetFiles)
 
+    @staticmethod
+    def get_project_filename(export_path, frame=None):
+        filename = os.path.abspath(bpy.path.ensure_ext(bpy.path.abspath(export_path), '.appleseed'))
+
+        if frame is not None:
+            filename = f"{os.path.splitext(filename)[0]}.{frame:04d}.appleseed"
+
+        return filename
+
     # Internal methods.
     def __create_project(self, depsgraph):
         logger.debug("appleseed: Creating appleseed project")
@@ -811,11 +941,126 @@ class SceneTranslator(object):
 
         self.__as_camera_translator.add_cam_xform(0.0, engine)
 
+        index_instances = self.__export_mode == ProjectExportMode.INTERACTIVE_RENDER
+
+        # Translators are created on the first instance seen, so objects the depsgraph does not render are never translated.
+        skipped_objects = set()
+
+        # Objects with identical meshes share a single mesh translator.
+        shared_meshes = dict()
+
         for inst in depsgraph.object_instances:
             if inst.show_self:
-                obj, inst_id = self.__get_instance_data(inst)
-                if obj in objects_to_add.keys():
-                    objects_to_add[obj].add_instance_step(0.0, inst_id, inst.matrix_world)
+                obj = self.__get_instance_object(inst)
+                if obj in skipped_objects:
+                    continue
+                if obj not in objects_to_add:
+                    translator = self.__create_object_translator(obj)
+                    if translator is None:
+                        skipped_objects.add(obj)
+                        continue
+                    if isinstance(translator, MeshTranslator):
+                        mesh_key = translator.get_shared_mesh_key(depsgraph)
+                        if mesh_key is not None:
+                            translator = shared_meshes.setdefault(mesh_key, translator)
+                    objects_to_add[obj] = translator
+                inst_id = self.__get_instance_id(inst, obj)
+                objects_to_add[obj].add_instance_step(0.0, inst_id, inst.matrix_world)
+                if index_instances:
+                    self.__index_instance(obj, inst, inst_id)
+
+        if shared_meshes:
+            shared_translators = set(shared_meshes.values())
+            logger.debug("appleseed: %d mesh objects share %d meshes",
+                         sum(1 for trans in objects_to_add.values() if trans in shared_translators),
+                         len(shared_meshes))
+
+    @staticmethod
+    def __unique_translators(translators):
+        # Several objects can map to the same translator when they share a mesh.
+        return dict.fromkeys(translators.values()).keys()
+
+    def __create_object_translator(self, obj):
+        if obj.type == 'LIGHT':
+            return LampTranslator(obj, self.__export_mode, self.__asset_handler)
+        elif obj.type == 'MESH' and len(obj.data.loops) > 0:
+            return MeshTranslator(obj, self.__export_mode, self.__asset_handler)
+        elif obj.type == 'EMPTY' and obj.appleseed.object_export == "archive_assembly":
+            return ArchiveAssemblyTranslator(obj, self.__asset_handler)
+
+        return None
+
+    @staticmethod
+    def __get_used_materials(objects):
+        materials = set()
+
+        for obj in objects:
+            if obj.type == 'MESH':
+                materials.update(slot.material.original for slot in obj.material_slots if slot.material is not None)
+
+        return materials
+
+    @staticmethod
+    def __get_used_images(depsgraph, objects):
+        images = set()
+
+        for obj in objects:
+            if obj.type == 'MESH':
+                images.add(obj.appleseed.object_alpha_texture)
+            elif obj.type == 'LIGHT':
+                images.add(obj.data.appleseed.radiance_tex)
+                images.add(obj.data.appleseed.radiance_multiplier_tex)
+
+        world = depsgraph.scene_eval.world
+        if world is not None:
+            images.add(world.appleseed_sky.env_tex)
+
+        camera = depsgraph.scene_eval.camera
+        if camera is not None and camera.type == 'CAMERA':
+            images.add(camera.data.appleseed.diaphragm_map)
+
+        return {image.original for image in images if image is not None}
+
+    def __index_instance(self, obj, instance, inst_id):
+        if instance.is_instance:
+            self.__instancers.setdefault(obj, set()).add(instance.parent.original)
+        else:
+            self.__instancers.setdefault(obj, set()).add(None)
+            self.__direct_instance_ids[obj] = inst_id
+
+    def __clear_instance_index(self, obj):
+        self.__instancers.pop(obj, None)
+        self.__direct_instance_ids.pop(obj, None)
+
+    def __index_collections(self, objects):
+        for obj in objects:
+            for coll in obj.users_collection:
+                self.__collection_members.setdefault(coll.original, set()).add(obj)
+
+    def __delete_removed_objects(self, objects):
+        for obj in objects:
+            if obj not in self.__as_object_translators or self.__is_object_alive(obj):
+                continue
+            self.__as_object_translators[obj].delete_object(self.as_main_assembly)
+            del self.__as_object_translators[obj]
+            self.__clear_instance_index(obj)
+            if self.__update_filter is not None:
+                self.__update_filter.forget(obj)
+
+    @staticmethod
+    def __is_object_alive(obj):
+        try:
+            return obj.name_full in bpy.data.objects or obj.name_full in bpy.data.lights
+        except ReferenceError:
+            return False
+
+    @staticmethod
+    def __is_collection_alive(coll):
+        try:
+            # Scene master collections are not part of bpy.data.collections.
+            return coll.name_full in bpy.data.collections or any(scene.collection == coll for scene in bpy.data.scenes)
+        except ReferenceError:
+            return False
 
     def __calc_motion_steps(self, depsgraph, engine, objects_to_add):
         self.__current_frame = depsgraph.scene_eval.frame_current
@@ -836,11 +1081,11 @@ class SceneTranslator(object):
                 for inst in depsgraph.object_instances:
                     if inst.show_self:
                         obj, inst_id = self.__get_instance_data(inst)
-                        if obj in objects_to_add.keys():
+                        if obj in objects_to_add:
                             objects_to_add[obj].add_instance_step(time, inst_id, inst.matrix_world)
 
             if time in self.__deform_times:
-                for translator in objects_to_add.values():
+                for translator in self.__unique_translators(objects_to_add):
                     translator.set_deform_key(time, depsgraph, index)
 
         engine.frame_set(self.__current_frame, subframe=0.0)
@@ -873,14 +1118,24 @@ class SceneTranslator(object):
 
     @staticmethod
     def __get_instance_data(instance):
+        obj = SceneTranslator.__get_instance_object(instance)
+
+        return obj, SceneTranslator.__get_instance_id(instance, obj)
+
+    @staticmethod
+    def __get_instance_object(instance):
         if instance.is_instance:  # Instance was generated by a particle system or dupli object.
-            obj = instance.instance_object.original
-            inst_id = f"{obj.appleseed.obj_name}|{instance.parent.original.name_full}|{instance.persistent_id[0]}"
-        else:  # Instance is a discreet object in the scene.
-            obj = instance.object.original
-            inst_id = f"{obj.appleseed.obj_name}|{instance.persistent_id[0]}"
+            return instance.instance_object.original
+
+        return instance.object.original  # Instance is a discreet object in the scene.
+
+    @staticmethod
+    def __get_instance_id(instance, obj):
+        # The id is built from the name the object's translator assigns, so the translator must exist first.
+        if instance.is_instance:
+            return f"{obj.appleseed.obj_name}|{instance.parent.original.name_full}|{instance.persistent_id[0]}"
 
-        return obj, inst_id
+        return f"{obj.appleseed.obj_name}|{instance.persistent_id[0]}"
 
     @staticmethod
     def __round_up_pow2(deformation_blur_samples):
@@ -0,0 +1,202 @@
+#
+# This source file is part of appleseed.
+# Visit http://appleseedhq.net/ for additional information and resources.
+#
+# This software is released under the MIT license.
+#
+# Copyright (c) 2019 The appleseedhq Organization
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+import bpy
+
+from .cycles_shaders import cycles_nodes, parse_cycles_shader
+from ..logger import get_logger
+from ..properties.nodes import AppleseedOSLNode
+from ..utils.util import fingerprint_properties
+
+logger = get_logger()
+
+
+class UpdateFilter(object):
+    """
+    Drops interactive updates for datablocks whose translated properties did not change.
+
+    Each fingerprint covers the properties the matching translator reads when it applies
+    an update, so an unchanged fingerprint means the update would not change the project.
+    """
+
+    def __init__(self):
+        self.__fingerprints = dict()
+
+        self.__filtered_updates = 0
+        self.__applied_updates = 0
+
+    @property
+    def filtered_updates(self):
+        return self.__filtered_updates
+
+    @property
+    def applied_updates(self):
+        return self.__applied_updates
+
+    def track(self, bl_id):
+        """
+        Records the current fingerprint of an already translated datablock.
+        """
+
+        fingerprint = self.__fingerprint(bl_id.original)
+        if fingerprint is not None:
+            self.__fingerprints[bl_id.original] = fingerprint
+
+    def forget(self, bl_id):
+        self.__fingerprints.pop(bl_id, None)
+
+    def has_changed(self, update):
+        """
+        Returns False if the datablock of the update has the same fingerprint as
+        when it was last translated.  Datablocks that are not tracked always count as changed,
+        as do geometry updates of mesh objects since their fingerprint does not cover the mesh.
+        """
+
+        bl_id = update.id.original
+
+        fingerprint = self.__fingerprint(bl_id)
+
+        if fingerprint is not None:
+            if self.__fingerprints.get(bl_id) == fingerprint and not self.__is_mesh_geometry_update(update):
+                self.__filtered_updates += 1
+                return False
+
+            self.__fingerprints[bl_id] = fingerprint
+
+        self.__applied_updates += 1
+
+        return True
+
+    def log_stats(self):
+        logger.debug("appleseed: Interactive updates filtered: %i, applied: %i",
+                     self.__filtered_updates,
+                     self.__applied_updates)
+
+    @staticmethod
+    def __is_mesh_geometry_update(update):
+        # Edit mode changes, modifiers and shape keys only show up as geometry updates.
+        return update.is_updated_geometry and isinstance(update.id, bpy.types.Object) and update.id.type == 'MESH'
+
+    @staticmethod
+    def __fingerprint(bl_id):
+        if isinstance(bl_id, bpy.types.Material):
+            return material_fingerprint(bl_id)
+        elif isinstance(bl_id, bpy.types.Object):
+            if bl_id.type == 'MESH':
+                return mesh_object_fingerprint(bl_id)
+            elif bl_id.type == 'LIGHT':
+                return lamp_fingerprint(bl_id)
+            elif bl_id.type == 'EMPTY' and bl_id.appleseed.object_export == "archive_assembly":
+                return (fingerprint_properties(bl_id.appleseed),
+                        matrix_fingerprint(bl_id.matrix_world))
+        elif isinstance(bl_id, bpy.types.World):
+            return fingerprint_properties(bl_id.appleseed_sky)
+        elif isinstance(bl_id, bpy.types.Scene):
+            return (bl_id.world.name_full if bl_id.world is not None else None,)
+
+        return None
+
+
+def matrix_fingerprint(matrix):
+    return tuple(tuple(row) for row in matrix)
+
+
+def node_tree_fingerprint(node_tree):
+    """
+    Fingerprints the node parameters and links read by NodeTreeTranslator.
+    """
+
+    if node_tree is None:
+        return None
+
+    nodes = list()
+
+    for node in node_tree.nodes:
+        if isinstance(node, AppleseedOSLNode):
+            parameters = list()
+
+            for key in getattr(node, 'parameter_types', dict()):
+                value = getattr(node, key, None)
+                if isinstance(value, bpy.types.Image):
+                    value = value.filepath
+                elif hasattr(value, '__len__') and not isinstance(value, str):
+                    value = tuple(value)
+                parameters.append((key, value))
+
+            script = getattr(node, 'script', None)
+            if script is not None:
+                parameters.append(('script', script.as_string()))
+
+            nodes.append((node.name, node.bl_idname, tuple(parameters)))
+        elif node.bl_idname in cycles_nodes:
+            nodes.append((node.name, node.bl_idname, tuple(sorted(parse_cycles_shader(node).items()))))
+        else:
+            nodes.append((node.name, node.bl_idname))
+
+    links = tuple((link.from_node.name,
+                   link.from_socket.identifier,
+                   link.to_node.name,
+                   link.to_socket.identifier) for link in node_tree.links)
+
+    return tuple(nodes), links
+
+
+def material_fingerprint(mat):
+    return (fingerprint_properties(mat.appleseed),
+            mat.use_nodes,
+            node_tree_fingerprint(mat.node_tree))
+
+
+def mesh_object_fingerprint(bl_obj):
+    # Instancers and particle emitters are never filtered, their instances
+    # depend on far more state than the object itself.
+    if len(bl_obj.particle_systems) > 0 or bl_obj.instance_type != 'NONE':
+        return None
+
+    material_slots = tuple((slot.material.name_full, slot.material.use_nodes) if slot.material is not None else None
+                           for slot in bl_obj.material_slots)
+
+    return (fingerprint_properties(bl_obj.appleseed),
+            fingerprint_properties(bl_obj.data.appleseed),
+            material_slots,
+            matrix_fingerprint(bl_obj.matrix_world))
+
+
+def lamp_fingerprint(bl_obj):
+    lamp_data = bl_obj.data
+
+    shape = (lamp_data.shape, lamp_data.size, lamp_data.size_y) if lamp_data.type == 'AREA' else None
+    spot = (lamp_data.spot_size, lamp_data.spot_blend) if lamp_data.type == 'SPOT' else None
+
+    return (fingerprint_properties(bl_obj.appleseed),
+            fingerprint_properties(lamp_data.appleseed),
+            lamp_data.type,
+            shape,
+            spot,
+            lamp_data.use_nodes,
+            node_tree_fingerprint(lamp_data.node_tree) if lamp_data.use_nodes else None,
+            matrix_fingerprint(bl_obj.matrix_world))
@@ -56,6 +56,8 @@ class ASRENDER_PT_export(bpy.types.Panel, ASRENDER_PT_base):
         if asr_scene_props.scene_export_mode == 'export_only':
             layout.prop(asr_scene_props, "export_path", text="Export Path")
             layout.prop(asr_scene_props, "export_selected", text="Only Export Selected Objects")
+            layout.prop(asr_scene_props, "export_incremental", text="Incremental Export")
+            layout.operator("appleseed.export_animation", text="Export Animation")
 
 
 class ASRENDER_PT_settings(bpy.types.Panel, ASRENDER_PT_base):
@@ -87,6 +89,13 @@ class ASRENDER_PT_settings(bpy.types.Panel, ASRENDER_PT_base):
         layout.separator()
 
         layout.prop(asr_scene_props, "tex_cache", text="Tex Cache")
+        row = layout.row(align=True)
+        row.prop(asr_scene_props, "geometry_cache_size", text="Geometry Cache")
+        row.operator("appleseed.clear_geometry_cache", text="", icon='TRASH')
+        col = layout.column(align=True)
+        col.prop(asr_scene_props, "tile_queue_depth", text="Tile Queue Depth")
+        col.prop(asr_scene_props, "result_update_interval", text="Result Update Interval")
+        col.prop(asr_scene_props, "stats_update_interval", text="Stats Update Interval")
 
         # Here be dragons
         box = layout.box()
@@ -194,6 +203,8 @@ class ASRENDER_PT_sampling_interactive(bpy.types.Panel, ASRENDER_PT_base):
         col.prop(asr_scene_props, "interactive_max_samples", text="Max Samples")
         col.prop(asr_scene_props, "interactive_max_time", text="Max Time in Seconds")
 
+        layout.prop(asr_scene_props, "interactive_update_window", text="Update Window")
+
 
 class ASRENDER_PT_sampling_filter(bpy.types.Panel, ASRENDER_PT_base):
     COMPAT_ENGINES = {'APPLESEED_RENDER'}
@@ -0,0 +1,129 @@
+#
+# This source file is part of appleseed.
+# Visit http://appleseedhq.net/ for additional information and resources.
+#
+# This software is released under the MIT license.
+#
+# Copyright (c) 2019 The appleseedhq Organization
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+
+"""
+Reads the parameters of compiled OSL shaders with appleseed's ShaderQuery.
+
+This module only imports appleseed, so it can also run in a separate Python process:
+
+    python osl_query.py shaders.json nodes.json
+
+reads a JSON list of .oso filenames and writes the list of parsed nodes.
+"""
+
+import json
+import sys
+
+import appleseed as asr
+
+
+def parse_shader(q, filename=None):
+    d = {'inputs': list(),
+         'outputs': list()}
+    shader_meta = q.get_metadata()
+    if 'as_node_name' in shader_meta:
+        d['name'] = shader_meta['as_node_name']['value']
+    else:
+        d['name'] = q.get_shader_name()
+    d['filename'] = filename
+    if 'URL' in shader_meta:
+        d['url'] = shader_meta['URL']['value']
+    else:
+        d['url'] = ''
+    if 'as_category' in shader_meta:
+        d['category'] = shader_meta['as_category']['value']
+    else:
+        d['category'] = 'other'
+    num_of_params = q.get_num_params()
+    for x in range(0, num_of_params):
+        metadata = dict()
+        param = q.get_param_info(x)
+        if 'metadata' in param:
+            metadata = param['metadata']
+        param_data = {'name': param['name'], 'type': param['type'], 'connectable': True, 'hide_ui': param['validdefault'] is False}
+        if 'default' in param:
+            param_data['default'] = param['default']
+        if 'label' in metadata:
+            param_data['label'] = metadata['label']['value']
+        if 'widget' in metadata:
+            param_data['widget'] = metadata['widget']['value']
+            if param_data['widget'] == 'null':
+                param_data['hide_ui'] = True
+        param_data['section'] = metadata['page']['value'] if 'page' in metadata else None
+        if 'min' in metadata:
+            param_data['min'] = metadata['min']['value']
+        if 'max' in metadata:
+            param_data['max'] = metadata['max']['value']
+        if 'softmin' in metadata:
+            param_data['softmin'] = metadata['softmin']['value']
+        if 'softmax' in metadata:
+            param_data['softmax'] = metadata['softmax']['value']
+        if 'help' in metadata:
+            param_data['help'] = metadata['help']['value']
+        if 'options' in metadata:
+            param_data['options'] = metadata['options']['value'].split(" = ")[-1].replace("\"", "").split("|")
+        if 'as_blender_input_socket' in metadata:
+            param_data['connectable'] = False if metadata['as_blender_input_socket']['value'] == 0.0 else True
+        if 'as_deprecated' in metadata:
+            param_data['hide_ui'] = True
+            param_data['connectable'] = False
+
+        if param['isoutput'] is True:
+            d['outputs'].append(param_data)
+        else:
+            d['inputs'].append(param_data)
+
+    return d
+
+
+def query_shader_files(filenames):
+    nodes = list()
+
+    if filenames:
+        q = asr.ShaderQuery()
+
+        for filename in filenames:
+            q.open(filename)
+            nodes.append(parse_shader(q, filename=filename))
+
+    return nodes
+
+
+def main():
+    input_path, output_path = sys.argv[1:3]
+
+    with open(input_path, 'r') as input_file:
+        filenames = json.load(input_file)
+
+    nodes = query_shader_files(filenames)
+
+    with open(output_path, 'w') as output_file:
+        json.dump(nodes, output_file)
+
+
+if __name__ == '__main__':
+    main()
@@ -24,17 +24,35 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 #
+import copy
+import hashlib
+import json
 import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
 
 import appleseed as asr
 import bpy
 
 from . import path_util, util
+from .osl_query import parse_shader, query_shader_files
+from .. import bl_info
 from ..logger import get_logger
 from ..properties.nodes import AppleseedOSLSocket
 
 logger = get_logger()
 
+# Seconds the shader query processes get before the shaders are queried in Blender instead.
+shader_query_timeout = 60.0
+
+# Number of compiled scripts kept in the bytecode cache, the least recently used ones are removed.
+bytecode_cache_size = 256
+
+osl_shader_declaration = re.compile(r"^\s*(shader|surface|displacement|volume)\s+\w+\s*\(", re.MULTILINE)
+
 
 def generate_node(node, node_class):
     """
@@ -187,7 +205,7 @@ def generate_node(node, node_class):
         socket_input_names.append({'socket_name': socket_name, 'socket_label': socket_label, 'hide_ui': hide_ui})
 
     # create node class
-    node_name = "Appleseed{0}Node".format(name)
+    node_name = get_node_idname(node)
     node_label = "{0}".format(name)
     ntype = type(node_name, (node_class,), {})
     ntype.bl_idname = node_name
@@ -386,6 +404,10 @@ def generate_node(node, node_class):
     return ntype.bl_idname, category, node_classes
 
 
+def get_node_idname(node):
+    return "Appleseed{0}Node".format(node['name'])
+
+
 def read_osl_shaders():
     """
     Reads parameters from OSL .oso files using the ShaderQuery function that is built
@@ -395,89 +417,171 @@ def read_osl_shaders():
     :return: List of parsed nodes
     """
 
-    nodes = list()
-
     shader_directories = path_util.get_osl_search_paths()
 
-    q = asr.ShaderQuery()
+    # Parsed shaders are cached on disk, only new or modified shaders are queried.
+    shader_cache = load_shader_cache()
+    updated_cache = dict()
+    cache_hits = 0
+    cache_misses = 0
 
     logger.debug("[appleseed] Parsing OSL shaders...")
 
+    shader_files = list()
+    stale_files = list()
+
     for shader_dir in shader_directories:
         if os.path.isdir(shader_dir):
             logger.debug("[appleseed] Searching {0} for OSO files...".format(shader_dir))
             for file in os.listdir(shader_dir):
                 if file.endswith(".oso") and os.path.basename(file) != "as_texture2surface.oso":
-                    logger.debug("[appleseed] Reading {0}...".format(file))
                     filename = os.path.join(shader_dir, file)
-                    q.open(filename)
-                    nodes.append(parse_shader(q, filename=filename))
+                    file_stat = os.stat(filename)
+
+                    cache_entry = shader_cache.get(filename)
+
+                    if cache_entry is not None and cache_entry['mtime'] == file_stat.st_mtime and cache_entry['size'] == file_stat.st_size:
+                        updated_cache[filename] = cache_entry
+                        cache_hits += 1
+                    else:
+                        updated_cache[filename] = {'mtime': file_stat.st_mtime,
+                                                   'size': file_stat.st_size}
+                        stale_files.append(filename)
+                        cache_misses += 1
+
+                    shader_files.append(filename)
+
+    for filename, node in zip(stale_files, query_shaders(stale_files)):
+        updated_cache[filename]['node'] = node
+
+    # generate_node modifies the parameter dictionaries, give it copies.
+    nodes = [copy.deepcopy(updated_cache[filename]['node']) for filename in shader_files]
+
+    if cache_misses > 0 or len(updated_cache) != len(shader_cache):
+        save_shader_cache(updated_cache)
 
-    logger.debug("[appleseed] OSL parsing complete.")
+    logger.debug("[appleseed] OSL parsing complete, shader cache: {0} hits, {1} misses.".format(cache_hits, cache_misses))
 
     return nodes
 
 
-def parse_shader(q, filename=None):
-    d = {'inputs': list(),
-         'outputs': list()}
-    shader_meta = q.get_metadata()
-    if 'as_node_name' in shader_meta:
-        d['name'] = shader_meta['as_node_name']['value']
-    else:
-        d['name'] = q.get_shader_name()
-    d['filename'] = filename
-    if 'URL' in shader_meta:
-        d['url'] = shader_meta['URL']['value']
-    else:
-        d['url'] = ''
-    if 'as_category' in shader_meta:
-        d['category'] = shader_meta['as_category']['value']
-    else:
-        d['category'] = 'other'
-    num_of_params = q.get_num_params()
-    for x in range(0, num_of_params):
-        metadata = dict()
-        param = q.get_param_info(x)
-        if 'metadata' in param:
-            metadata = param['metadata']
-        param_data = {'name': param['name'], 'type': param['type'], 'connectable': True, 'hide_ui': param['validdefault'] is False}
-        if 'default' in param:
-            param_data['default'] = param['default']
-        if 'label' in metadata:
-            param_data['label'] = metadata['label']['value']
-        if 'widget' in metadata:
-            param_data['widget'] = metadata['widget']['value']
-            if param_data['widget'] == 'null':
-                param_data['hide_ui'] = True
-        param_data['section'] = metadata['page']['value'] if 'page' in metadata else None
-        if 'min' in metadata:
-            param_data['min'] = metadata['min']['value']
-        if 'max' in metadata:
-            param_data['max'] = metadata['max']['value']
-        if 'softmin' in metadata:
-            param_data['softmin'] = metadata['softmin']['value']
-        if 'softmax' in metadata:
-            param_data['softmax'] = metadata['softmax']['value']
-        if 'help' in metadata:
-            param_data['help'] = metadata['help']['value']
-        if 'options' in metadata:
-            param_data['options'] = metadata['options']['value'].split(" = ")[-1].replace("\"", "").split("|")
-        if 'as_blender_input_socket' in metadata:
-            param_data['connectable'] = False if metadata['as_blender_input_socket']['value'] == 0.0 else True
-        if 'as_deprecated' in metadata:
-            param_data['hide_ui'] = True
-            param_data['connectable'] = False
-
-        if param['isoutput'] is True:
-            d['outputs'].append(param_data)
-        else:
-            d['inputs'].append(param_data)
+def query_shaders(filenames):
+    """
+    Parses the given .oso files, spreading the work over several Python processes when
+    there are enough of them to be worth it.
+    :return: List of parsed nodes, in the same order as filenames
+    """
 
-    return d
+    workers = min(os.cpu_count(), len(filenames) // 8)
+    python_path = get_python_executable()
 
+    if workers > 1 and python_path is not None:
+        try:
+            return query_shaders_in_processes(python_path, filenames, workers)
+        except (OSError, ValueError, KeyError, subprocess.SubprocessError) as e:
+            logger.debug("[appleseed] Parallel OSL shader query failed, querying serially: {0}".format(e))
 
-def compile_osl_bytecode(compiler, script_block):
+    return query_shader_files(filenames)
+
+
+def query_shaders_in_processes(python_path, filenames, workers):
+    """
+    Runs osl_query.py in new Python processes, which only import appleseed.  Blender itself is never
+    forked, and processes that do not finish within shader_query_timeout are killed.
+    """
+
+    chunks = [filenames[i::workers] for i in range(workers)]
+
+    temp_dir = tempfile.mkdtemp(prefix="appleseed_osl_query_")
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(path for path in sys.path if path))
+    processes = list()
+
+    try:
+        for index, chunk in enumerate(chunks):
+            input_path = os.path.join(temp_dir, "input_{0}.json".format(index))
+            output_path = os.path.join(temp_dir, "output_{0}.json".format(index))
+            with open(input_path, 'w') as input_file:
+                json.dump(chunk, input_file)
+
+            process = subprocess.Popen([python_path, os.path.join(os.path.dirname(__file__), "osl_query.py"), input_path, output_path],
+                                       stdin=subprocess.DEVNULL,
+                                       stdout=subprocess.DEVNULL,
+                                       stderr=subprocess.DEVNULL,
+                                       env=env)
+            processes.append((process, output_path))
+
+        deadline = time.time() + shader_query_timeout
+        nodes_by_filename = dict()
+
+        for chunk, (process, output_path) in zip(chunks, processes):
+            return_code = process.wait(timeout=max(0.0, deadline - time.time()))
+            if return_code != 0:
+                raise subprocess.CalledProcessError(return_code, python_path)
+
+            with open(output_path, 'r') as output_file:
+                nodes_by_filename.update(zip(chunk, json.load(output_file)))
+    finally:
+        for process, _ in processes:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+
+        for file in os.listdir(temp_dir):
+            os.remove(os.path.join(temp_dir, file))
+        os.rmdir(temp_dir)
+
+    logger.debug("[appleseed] Queried {0} OSL shaders with {1} processes.".format(len(filenames), workers))
+
+    return [nodes_by_filename[filename] for filename in filenames]
+
+
+def get_python_executable():
+    # Before 2.91 sys.executable is the Blender executable.
+    if bpy.app.version < (2, 91, 0):
+        return getattr(bpy.app, 'binary_path_python', None)
+
+    return sys.executable
+
+
+def get_cache_dir():
+    return bpy.utils.user_resource('CONFIG', path="blenderseed", create=True) or tempfile.gettempdir()
+
+
+def get_shader_cache_path():
+    return os.path.join(get_cache_dir(), "osl_shader_cache.json")
+
+
+def load_shader_cache():
+    """
+    Returns the cached shader metadata by .oso filename, or an empty cache if
+    there is no cache file or it was written by a different add-on version.
+    """
+
+    try:
+        with open(get_shader_cache_path(), 'r') as cache_file:
+            cache = json.load(cache_file)
+    except (OSError, ValueError):
+        return dict()
+
+    if cache.get('version') != list(bl_info['version']):
+        return dict()
+
+    return cache.get('shaders', dict())
+
+
+def save_shader_cache(shaders):
+    cache_path = get_shader_cache_path()
+    temp_path = "{0}.{1}.tmp".format(cache_path, os.getpid())
+
+    try:
+        with open(temp_path, 'w') as cache_file:
+            json.dump({'version': list(bl_info['version']), 'shaders': shaders}, cache_file)
+        os.replace(temp_path, cache_path)
+    except (OSError, TypeError) as e:
+        logger.debug("[appleseed] Could not save OSL shader cache {0}: {1}".format(cache_path, e))
+
+
+def get_script_source(script_block):
     osl_path = bpy.path.abspath(script_block.filepath, library=script_block.library)
     if script_block.is_in_memory or script_block.is_dirty or script_block.is_modified or not os.path.exists(osl_path):
         source_code = script_block.as_string()
@@ -486,4 +590,121 @@ def compile_osl_bytecode(compiler, script_block):
         source_code = code.read()
         code.close()
 
-    return compiler.compile_buffer(source_code)
+    return source_code
+
+
+def is_osl_script(script_block):
+    for name in (script_block.name, script_block.filepath):
+        extension = os.path.splitext(name)[1].lower()
+        if extension in ('.osl', '.oslx'):
+            return True
+        if extension == '.py':
+            return False
+
+    return osl_shader_declaration.search(get_script_source(script_block)) is not None
+
+
+def compile_osl_bytecode(compiler, script_block):
+    return compile_osl_source(compiler, get_script_source(script_block))
+
+
+def compile_osl_source(compiler, source_code):
+    """
+    Returns the bytecode of OSL source code, or None if it does not compile.
+    Bytecode is cached on disk, the compiler is only used for source that was never compiled
+    and is created on demand if it is None.
+    """
+
+    bytecode_file = get_bytecode_file(source_code)
+
+    if os.path.exists(bytecode_file):
+        # The modification time tracks when the bytecode was last used.
+        os.utime(bytecode_file)
+        with open(bytecode_file, 'r') as bytecode:
+            return bytecode.read()
+
+    # Source that failed to compile is not compiled again until it changes.
+    failed_file = f"{bytecode_file}.failed"
+
+    if os.path.exists(failed_file):
+        os.utime(failed_file)
+        return None
+
+    if compiler is None:
+        compiler = asr.ShaderCompiler(path_util.get_stdosl_paths())
+
+    osl_bytecode = compiler.compile_buffer(source_code)
+
+    try:
+        if osl_bytecode is None:
+            open(failed_file, 'w').close()
+        else:
+            temp_file = f"{bytecode_file}.{os.getpid()}.tmp"
+            with open(temp_file, 'w') as bytecode:
+                bytecode.write(osl_bytecode)
+            os.replace(temp_file, bytecode_file)
+
+        prune_bytecode_cache()
+    except OSError as e:
+        logger.debug("[appleseed] Could not cache OSL bytecode {0}: {1}".format(bytecode_file, e))
+
+    return osl_bytecode
+
+
+def prune_bytecode_cache():
+    """
+    Removes the least recently used files once the bytecode cache holds more than bytecode_cache_size scripts.
+    """
+
+    bytecode_dir = get_bytecode_dir()
+
+    cache_files = [os.path.join(bytecode_dir, file) for file in os.listdir(bytecode_dir)
+                   if file.endswith(".oso") or file.endswith(".failed")]
+
+    if len(cache_files) <= bytecode_cache_size:
+        return
+
+    cache_files.sort(key=os.path.getmtime)
+
+    for cache_file in cache_files[:len(cache_files) - bytecode_cache_size]:
+        os.remove(cache_file)
+
+    logger.debug("[appleseed] Removed {0} scripts from the OSL bytecode cache".format(len(cache_files) - bytecode_cache_size))
+
+
+def get_compiled_shader(source_code):
+    """
+    Returns the path of the cached .oso file for OSL source code, compiling it if needed,
+    or None if it does not compile.
+    """
+
+    if compile_osl_source(None, source_code) is None:
+        return None
+
+    return get_bytecode_file(source_code)
+
+
+def get_bytecode_file(source_code):
+    """
+    Returns the bytecode cache path for OSL source code.  The path depends on the source, on the
+    stdosl.h the source is compiled against and on the add-on version.
+    """
+
+    stdosl_path = path_util.get_stdosl_paths()
+
+    key = hashlib.blake2b(digest_size=16)
+    key.update(source_code.encode('utf-8'))
+    key.update(stdosl_path.encode('utf-8'))
+    if os.path.exists(stdosl_path):
+        stdosl_stat = os.stat(stdosl_path)
+        key.update(f"{stdosl_stat.st_mtime}:{stdosl_stat.st_size}".encode('utf-8'))
+    key.update(str(bl_info['version']).encode('utf-8'))
+
+    return os.path.join(get_bytecode_dir(), f"as_script_{key.hexdigest()}.oso")
+
+
+def get_bytecode_dir():
+    bytecode_dir = os.path.join(get_cache_dir(), "osl_bytecode")
+    os.makedirs(bytecode_dir, exist_ok=True)
+
+    return bytecode_dir
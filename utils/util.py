@@ -26,14 +26,17 @@
 #
 
 import datetime
+import hashlib
 import os
 
+import numpy as np
+
 import bpy
 import bpy_extras
 from bpy.app.handlers import persistent
 
 import appleseed as asr
-from . import path_util, osl_utils
+from . import osl_utils
 from ..logger import get_logger
 from ..properties.nodes import AppleseedOSLScriptNode
 
@@ -67,13 +70,42 @@ def clamp_value(n, smallest, largest):
     return max(smallest, min(n, largest))
 
 
-def filter_params(params):
-    filter_list = list()
-    for p in params:
-        if p not in filter_list:
-            filter_list.append(p)
-    
-    return filter_list
+def fingerprint_properties(bl_struct, skip=()):
+    """
+    Returns a hashable snapshot of the RNA properties of a struct, such as a PropertyGroup.
+    Datablock pointers are reduced to the datablock name and nested property groups are
+    fingerprinted recursively.
+    """
+
+    if bl_struct is None:
+        return None
+
+    values = list()
+
+    for prop in bl_struct.bl_rna.properties:
+        identifier = prop.identifier
+        if identifier == 'rna_type' or identifier in skip:
+            continue
+
+        value = getattr(bl_struct, identifier)
+
+        if prop.type == 'POINTER':
+            if isinstance(value, bpy.types.ID):
+                value = value.name_full
+            elif isinstance(value, bpy.types.PropertyGroup):
+                value = fingerprint_properties(value)
+            else:
+                continue
+        elif prop.type == 'COLLECTION':
+            value = tuple(fingerprint_properties(item) for item in value)
+        elif isinstance(value, set):
+            value = tuple(sorted(value))
+        elif prop.type != 'STRING' and getattr(prop, 'is_array', False):
+            value = tuple(value)
+
+        values.append((identifier, value))
+
+    return tuple(values)
 
 
 def realpath(path):
@@ -104,13 +136,13 @@ def update_project(_):
     :return:
     """
 
-    # Compile all OSL Script nodes
-    stdosl_path = path_util.get_stdosl_paths()
-    compiler = asr.ShaderCompiler(stdosl_path)
+    # Compile all OSL Script nodes, scripts that were compiled before are read from the bytecode cache
     q = asr.ShaderQuery()
     for script in bpy.data.texts:
-        osl_bytecode = osl_utils.compile_osl_bytecode(compiler,
-                                                      script)
+        if not osl_utils.is_osl_script(script):
+            continue
+
+        osl_bytecode = osl_utils.compile_osl_bytecode(None, script)
         if osl_bytecode is not None:
             q.open_bytecode(osl_bytecode)
 
@@ -225,6 +257,42 @@ def is_object_deforming(ob):
     return False
 
 
+def get_mesh_fingerprint(me):
+    """
+    Returns a hash of the content of a mesh: vertex positions, faces, material indices,
+    smoothing, render UVs and custom normals.
+
+    Attributes are read with foreach_get into NumPy buffers, which is much cheaper
+    than converting the mesh, so the fingerprint can be used to detect unchanged meshes.
+    Custom normals are computed in place, so meshes with custom normals must be evaluated meshes from to_mesh().
+    """
+
+    mesh_hash = hashlib.blake2b(digest_size=16)
+
+    def hash_attribute(collection, attr, dtype, width=1):
+        values = np.empty(len(collection) * width, dtype=dtype)
+        collection.foreach_get(attr, values)
+        mesh_hash.update(values.tobytes())
+
+    hash_attribute(me.vertices, 'co', np.float32, 3)
+    hash_attribute(me.loops, 'vertex_index', np.int32)
+    hash_attribute(me.polygons, 'loop_total', np.int32)
+    hash_attribute(me.polygons, 'material_index', np.int32)
+    hash_attribute(me.polygons, 'use_smooth', np.bool_)
+
+    for uv_layer in me.uv_layers:
+        if uv_layer.active_render:
+            hash_attribute(uv_layer.data, 'uv', np.float32, 2)
+
+    mesh_hash.update(repr((me.use_auto_smooth, me.auto_smooth_angle, me.has_custom_normals)).encode())
+
+    if me.has_custom_normals:
+        me.calc_normals_split()
+        hash_attribute(me.loops, 'normal', np.float32, 3)
+
+    return mesh_hash.hexdigest()
+
+
 # ------------------------------------
 # Simple timer for profiling.
 # ------------------------------------